@@ -61,6 +61,13 @@ _BLOCKED_FUNCTIONS = re.compile(
 # Maximum query length in characters (100KB) — prevents abuse via enormous queries.
 _MAX_QUERY_LENGTH = 100_000
 
+# Parameter-free connection setup, sent as one script so DuckDB parses it in a
+# single call. DuckDB only binds prepared parameters in the last statement of a
+# script, so the credential SETs below stay one parameterised execute each.
+_EXTENSION_SETUP_SQL = (
+    "INSTALL httpfs; LOAD httpfs; INSTALL iceberg; LOAD iceberg; SET s3_url_style = 'path';"
+)
+
 
 class QueryTimeoutError(RuntimeError):
     """Raised when a query exceeds its per-query timeout.
@@ -141,22 +148,24 @@ class QueryEngine:
     def _create_connection(self) -> duckdb.DuckDBPyConnection:
         # S3 setup is intentionally aligned with runner/src/rat_runner/engine.py.
         # Keep both in sync when changing DuckDB S3 configuration. See task P6-01.
-        conn = duckdb.connect(":memory:")
-        conn.execute("INSTALL httpfs; LOAD httpfs;")
-        conn.execute("INSTALL iceberg; LOAD iceberg;")
+        # Memory and thread limits to prevent resource exhaustion. These are
+        # core options, so they go in at connect time rather than as SETs.
+        conn = duckdb.connect(
+            ":memory:",
+            config={
+                "memory_limit": self._duckdb_config.memory_limit,
+                "threads": self._duckdb_config.threads,
+            },
+        )
+        conn.execute(_EXTENSION_SETUP_SQL)
         conn.execute("SET s3_endpoint = ?", [self._s3_config.endpoint])
         conn.execute("SET s3_access_key_id = ?", [self._s3_config.access_key])
         conn.execute("SET s3_secret_access_key = ?", [self._s3_config.secret_key])
-        conn.execute("SET s3_url_style = 'path'")
         conn.execute("SET s3_use_ssl = ?", [self._s3_config.use_ssl])
         conn.execute("SET s3_region = ?", [self._s3_config.region])
         if self._s3_config.session_token:
             conn.execute("SET s3_session_token = ?;", [self._s3_config.session_token])
 
-        # Memory and thread limits to prevent resource exhaustion
-        conn.execute("SET memory_limit = ?", [self._duckdb_config.memory_limit])
-        conn.execute("SET threads = ?", [self._duckdb_config.threads])
-
         # Optional: federated user-data Postgres. ATTACH makes the
         # postgres tables queryable as `{alias}.{schema}.{table}` in any
         # SELECT — DuckDB pushes filters down to postgres where it can.
@@ -28,7 +28,9 @@ class TestQueryEngine:
             mock_connect.return_value = mock_conn
             engine = QueryEngine(s3_config)
 
-        mock_connect.assert_called_once_with(":memory:")
+        mock_connect.assert_called_once_with(
+            ":memory:", config={"memory_limit": "2GB", "threads": 4}
+        )
         assert engine._conn is mock_conn
 
     def test_configures_s3_extensions(self, s3_config: S3Config):
@@ -42,6 +44,17 @@ class TestQueryEngine:
         assert any("iceberg" in str(c) for c in calls)
         assert any("s3_endpoint" in str(c) for c in calls)
 
+    def test_extension_setup_is_one_statement_batch(self, s3_config: S3Config):
+        with patch("rat_query.engine.duckdb.connect") as mock_connect:
+            mock_conn = MagicMock()
+            mock_connect.return_value = mock_conn
+            QueryEngine(s3_config)
+
+        setup_sql = mock_conn.execute.call_args_list[0].args[0]
+        assert "LOAD httpfs" in setup_sql
+        assert "LOAD iceberg" in setup_sql
+        assert "s3_url_style" in setup_sql
+
     def test_skips_session_token_when_empty(self, s3_config: S3Config):
         with patch("rat_query.engine.duckdb.connect") as mock_connect:
             mock_conn = MagicMock()
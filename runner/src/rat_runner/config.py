@@ -425,6 +425,9 @@ def merge_configs(
 _BOTO3_CLIENT_TTL_SECONDS = 45 * 60
 _boto3_client_cache: dict[S3Config, tuple[S3ClientType, float]] = {}
 
+# Clock used for TTL checks — module-level so tests can substitute a fake clock.
+_now = time.monotonic
+
 
 def _boto3_client(s3_config: S3Config) -> S3ClientType:
     """Create a TTL-cached boto3 S3 client, including session token if present (STS).
@@ -433,7 +436,7 @@ def _boto3_client(s3_config: S3Config) -> S3ClientType:
     Different STS credentials produce different cache entries.
     Cached clients expire after 45 minutes to handle STS token rotation.
     """
-    now = time.monotonic()
+    now = _now()
     cached = _boto3_client_cache.get(s3_config)
     if cached is not None:
         client, created_at = cached
@@ -23,6 +23,14 @@ class QueryTimeoutError(RuntimeError):
     """
 
 
+# Parameter-free connection setup, sent as one script so DuckDB parses it in a
+# single call. DuckDB only binds prepared parameters in the last statement of a
+# script, so the credential SETs below stay one parameterised execute each.
+_EXTENSION_SETUP_SQL = (
+    "INSTALL httpfs; LOAD httpfs; INSTALL iceberg; LOAD iceberg; SET s3_url_style = 'path';"
+)
+
+
 def _to_arrow_table(arrow_result: pa.Table | pa.RecordBatchReader) -> pa.Table:
     """Convert a DuckDB .arrow() result to a PyArrow Table.
 
@@ -51,19 +59,23 @@ class DuckDBEngine:
     def _create_connection(self) -> duckdb.DuckDBPyConnection:
         # S3 setup is intentionally aligned with query/src/rat_query/engine.py.
         # Keep both in sync when changing DuckDB S3 configuration. See task P6-01.
-        conn = duckdb.connect(":memory:")
-        conn.execute("INSTALL httpfs; LOAD httpfs;")
-        conn.execute("INSTALL iceberg; LOAD iceberg;")
+        # Resource limits are core options, so they go in at connect time
+        # rather than as SET statements.
+        conn = duckdb.connect(
+            ":memory:",
+            config={
+                "memory_limit": self._duckdb_config.memory_limit,
+                "threads": self._duckdb_config.threads,
+            },
+        )
+        conn.execute(_EXTENSION_SETUP_SQL)
         conn.execute("SET s3_endpoint = ?", [self._s3_config.endpoint])
         conn.execute("SET s3_access_key_id = ?", [self._s3_config.access_key])
         conn.execute("SET s3_secret_access_key = ?", [self._s3_config.secret_key])
-        conn.execute("SET s3_url_style = 'path'")
         conn.execute("SET s3_use_ssl = ?", [self._s3_config.use_ssl])
         conn.execute("SET s3_region = ?", [self._s3_config.region])
         if self._s3_config.session_token:
             conn.execute("SET s3_session_token = ?;", [self._s3_config.session_token])
-        conn.execute("SET memory_limit = ?", [self._duckdb_config.memory_limit])
-        conn.execute("SET threads = ?", [self._duckdb_config.threads])
         return conn
 
     @property
@@ -130,8 +142,9 @@ class DuckDBEngine:
         """
         explain_sql = f"EXPLAIN ANALYZE ({sql})"
         result = self.conn.execute(explain_sql)
-        rows = result.fetchall()
-        return "\n".join(row[1] for row in rows)
+        # str.join sizes its output exactly up front; handing it a list (not a
+        # generator) spares it the internal materialisation pass.
+        return "\n".join([row[1] for row in result.fetchall()])
 
     def get_memory_stats(self) -> dict[str, int]:
         """Return DuckDB memory usage from PRAGMA database_size."""
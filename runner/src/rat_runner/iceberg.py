@@ -49,7 +49,7 @@ from __future__ import annotations
 import contextlib
 import logging
 import re
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import duckdb
 import pyarrow as pa
@@ -63,6 +63,7 @@ from pyiceberg.transforms import (
     HourTransform,
     IdentityTransform,
     MonthTransform,
+    Transform,
     YearTransform,
 )
 
@@ -84,6 +85,9 @@ _SAFE_IDENTIFIER = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
 # and we fall back to the full-rewrite approach.
 _MAX_COMPOSITE_DELETE_ROWS = 500
 
+# Scratch column _dedup_new_data numbers rows with; never written to a table.
+_DEDUP_ROW_INDEX = "__rat_dedup_row_index"
+
 
 def _escape_sql_string(value: str) -> str:
     """Escape a string value for safe inclusion in a SQL single-quoted literal.
@@ -144,13 +148,15 @@ def ensure_namespace(catalog: RestCatalog, namespace: str) -> None:
             catalog.create_namespace(ns_tuple)
 
 
-# Mapping from transform name to PyIceberg transform class.
-_TRANSFORM_MAP: dict[str, type] = {
-    "identity": IdentityTransform,
-    "day": DayTransform,
-    "month": MonthTransform,
-    "year": YearTransform,
-    "hour": HourTransform,
+# Mapping from transform name to a shared PyIceberg transform instance. These
+# transforms carry no state (they are frozen models), so one instance per kind
+# can back every PartitionField instead of a fresh object per spec build.
+_TRANSFORM_MAP: dict[str, Transform[Any, Any]] = {
+    "identity": IdentityTransform(),
+    "day": DayTransform(),
+    "month": MonthTransform(),
+    "year": YearTransform(),
+    "hour": HourTransform(),
 }
 
 
@@ -182,8 +188,8 @@ def build_partition_spec(
             )
         source_id = column_names.index(entry.column) + 1
 
-        transform_cls = _TRANSFORM_MAP.get(entry.transform)
-        if transform_cls is None:
+        transform = _TRANSFORM_MAP.get(entry.transform)
+        if transform is None:
             raise ValueError(
                 f"Unsupported partition transform '{entry.transform}'. "
                 f"Must be one of: {', '.join(sorted(_TRANSFORM_MAP.keys()))}"
@@ -193,7 +199,7 @@ def build_partition_spec(
             PartitionField(
                 source_id=source_id,
                 field_id=1000 + i,  # partition field IDs start at 1000 by convention
-                transform=transform_cls(),
+                transform=transform,
                 name=f"{entry.column}_{entry.transform}"
                 if entry.transform != "identity"
                 else entry.column,
@@ -277,13 +283,13 @@ def _build_delete_filter_single_key(
     This is the efficient path: a single IN(...) predicate that PyIceberg
     can push down to data file pruning.
     """
-    # Convert PyArrow array to Python list for PyIceberg's In() expression.
+    # Deduplicate before converting for PyIceberg's In() expression: for Arrow
+    # input, unique() runs Arrow's hash kernel over the buffers so only the
+    # distinct values are materialised as Python objects.
     if isinstance(values, pa.Array | pa.ChunkedArray):
-        py_values = values.to_pylist()
+        unique_values = values.unique().to_pylist()
     else:
-        py_values = list(values)
-    # Remove duplicates while preserving type.
-    unique_values = list(set(py_values))
+        unique_values = list(set(values))
     return In(key_column, unique_values)
 
 
@@ -405,15 +411,15 @@ def _try_optimized_delete_append(
     try:
         existing_count = _get_row_count(table)
 
-        # Count rows that will be deleted (for accurate total calculation).
-        deleted_data = table.scan(row_filter=delete_filter).to_arrow()
-        deleted_count = len(deleted_data)
-
-        # Delete rows matching the key values, then append new data.
+        # Delete rows matching the key values, then append new data. The
+        # deleted count comes from the snapshot summaries either side of the
+        # delete, so no data files are read to compute it.
         table.delete(delete_filter)
+        remaining_count = _get_row_count(table)
+        deleted_count = existing_count - remaining_count
         table.append(new_data)
 
-        total = existing_count - deleted_count + len(new_data)
+        total = remaining_count + len(new_data)
         logger.info(
             "Optimized delete+append: deleted %d, appended %d, total %d",
             deleted_count,
@@ -432,36 +438,20 @@ def _try_optimized_delete_append(
 def _dedup_new_data(
     new_data: pa.Table,
     unique_key: tuple[str, ...] | list[str],
-    conn: duckdb.DuckDBPyConnection | None = None,
 ) -> pa.Table:
     """Deduplicate new_data on unique_key, keeping the last row (by position).
 
-    Uses DuckDB for efficient deduplication with ROW_NUMBER() OVER().
+    Runs in Arrow compute: group by the key columns, take the max row index per
+    group, then take() those rows in their original order. No DuckDB connection
+    or Arrow -> DuckDB -> Arrow round-trip is needed for this step.
     """
-    own_conn = conn is None
-    if own_conn:
-        conn = duckdb.connect(":memory:")
-    try:
-        conn.register("new_data_dedup_raw", new_data)
-        col_names = ", ".join(new_data.column_names)
-        safe_keys = _validate_identifiers(unique_key)
-        key_cols = ", ".join(safe_keys)
-
-        conn.execute(
-            "CREATE TABLE new_data_dedup AS "
-            "SELECT *, ROW_NUMBER() OVER () AS _rn FROM new_data_dedup_raw"
-        )
-
-        dedup_sql = f"""
-            SELECT {col_names} FROM new_data_dedup
-            QUALIFY ROW_NUMBER() OVER (
-                PARTITION BY {key_cols} ORDER BY _rn DESC
-            ) = 1
-        """
-        return _to_arrow_table(conn.execute(dedup_sql).arrow())
-    finally:
-        if own_conn:
-            conn.close()
+    indexed = new_data.append_column(
+        _DEDUP_ROW_INDEX, pa.array(range(new_data.num_rows), type=pa.int64())
+    )
+    last_rows = indexed.group_by(list(unique_key), use_threads=False).aggregate(
+        [(_DEDUP_ROW_INDEX, "max")]
+    )
+    return new_data.take(last_rows.column(f"{_DEDUP_ROW_INDEX}_max").sort())
 
 
 def merge_iceberg(
@@ -517,7 +507,7 @@ def merge_iceberg(
 
     # Optimized path: dedup first, then delete+append (avoids full table rewrite).
     # Only works for single-column unique keys where PyIceberg In() is efficient.
-    deduped = _dedup_new_data(new_data, unique_key, conn)
+    deduped = _dedup_new_data(new_data, unique_key)
     optimized_result = _try_optimized_delete_append(table, deduped, unique_key)
     if optimized_result is not None:
         return optimized_result
@@ -821,7 +811,7 @@ def scd2_iceberg(
 
     # Deduplicate new_data on unique_key (last row wins by position) to
     # prevent duplicate SCD2 inserts when new_data contains repeated keys.
-    new_data = _dedup_new_data(new_data, unique_key, conn)
+    new_data = _dedup_new_data(new_data, unique_key)
 
     own_conn = conn is None
     if own_conn:
@@ -60,6 +60,10 @@ class RunLogger:
     def _log(self, level: str, message: str) -> None:
         self._run.add_log(level, message)
         py_level = _LEVEL_MAP.get(level, logging.INFO)
+        # Skip building the extras dict (and logging's LogRecord) for lines the
+        # stdlib side would drop anyway — the run deque above still has them.
+        if not logger.isEnabledFor(py_level):
+            return
         # The JSON formatter promotes every extras key to a top-level field,
         # so downstream tooling can filter on ``run_id``/``request_id`` etc.
         # We send the raw message (no ``[run_id]`` prefix) because that data
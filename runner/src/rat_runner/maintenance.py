@@ -13,6 +13,8 @@ from typing import TYPE_CHECKING
 from rat_runner.iceberg import get_catalog
 
 if TYPE_CHECKING:
+    from pyiceberg.table import Table as IcebergTable
+
     from rat_runner.config import NessieConfig, S3Config
     from rat_runner.models import PipelineLogger
 
@@ -24,30 +26,37 @@ def expire_snapshots(
     max_age_days: int,
     s3_config: S3Config,
     nessie_config: NessieConfig,
+    table: IcebergTable | None = None,
 ) -> int:
     """Expire Iceberg snapshots older than max_age_days.
 
-    Uses PyIceberg's manage_snapshots() to expire old snapshots.
+    Uses PyIceberg's manage_snapshots() to expire old snapshots. Pass ``table``
+    to reuse an already-loaded table instead of loading it from the catalog.
     Returns the number of snapshots expired, or 0 on failure.
     """
     try:
-        catalog = get_catalog(s3_config, nessie_config)
-
         # Parse table_name: "namespace.layer.name" → ("namespace", "layer.name")
         parts = table_name.split(".", 1)
         if len(parts) != 2:
             logger.warning(f"maintenance: invalid table name format: {table_name}")
             return 0
 
-        table = catalog.load_table(table_name)
+        if table is None:
+            table = get_catalog(s3_config, nessie_config).load_table(table_name)
+
+        snapshots_before = len(table.metadata.snapshots)
+        # The current snapshot is never expired, so a single-snapshot table
+        # has nothing to do — skip the commit.
+        if snapshots_before <= 1:
+            return 0
+
         cutoff = datetime.now(UTC) - timedelta(days=max_age_days)
         cutoff_ms = int(cutoff.timestamp() * 1000)
 
-        snapshots_before = len(table.metadata.snapshots)
         table.manage_snapshots().expire_snapshots_older_than(cutoff_ms).commit()
 
-        # Reload to count remaining
-        table = catalog.load_table(table_name)
+        # commit() swaps the catalog's response metadata into ``table`` in place,
+        # so the remaining count is already current — no reload round-trip.
         snapshots_after = len(table.metadata.snapshots)
         expired = snapshots_before - snapshots_after
 
@@ -65,19 +74,20 @@ def remove_orphan_files(
     max_age_days: int,
     s3_config: S3Config,
     nessie_config: NessieConfig,
+    table: IcebergTable | None = None,
 ) -> int:
     """Remove orphan data files from S3 that are no longer referenced by any snapshot.
 
     Compares files in the table's S3 location against files referenced in snapshots.
     Deletes files older than max_age_days that are not in any snapshot's manifest.
-    Returns the number of files removed, or 0 on failure.
+    Pass ``table`` to reuse an already-loaded table instead of loading it from the
+    catalog. Returns the number of files removed, or 0 on failure.
     """
     try:
         import boto3
 
-        catalog = get_catalog(s3_config, nessie_config)
-
-        table = catalog.load_table(table_name)
+        if table is None:
+            table = get_catalog(s3_config, nessie_config).load_table(table_name)
 
         # Collect all referenced data files from all snapshots
         referenced_files: set[str] = set()
@@ -162,11 +172,19 @@ def run_maintenance(
         if log:
             log.info(f"Running Iceberg maintenance on {table_name}")
 
-        expired = expire_snapshots(table_name, snapshot_max_age_days, s3_config, nessie_config)
+        # Load once and share: expire's commit updates table.metadata in place,
+        # so the orphan scan below sees the post-expiry snapshot list.
+        table = get_catalog(s3_config, nessie_config).load_table(table_name)
+
+        expired = expire_snapshots(
+            table_name, snapshot_max_age_days, s3_config, nessie_config, table=table
+        )
         if log and expired > 0:
             log.info(f"Expired {expired} old snapshot(s)")
 
-        removed = remove_orphan_files(table_name, orphan_max_age_days, s3_config, nessie_config)
+        removed = remove_orphan_files(
+            table_name, orphan_max_age_days, s3_config, nessie_config, table=table
+        )
         if log and removed > 0:
             log.info(f"Removed {removed} orphan file(s)")
 
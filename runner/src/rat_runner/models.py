@@ -38,9 +38,13 @@ class RunStatus(Enum):
         return self in (RunStatus.SUCCESS, RunStatus.FAILED, RunStatus.CANCELLED)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LogRecord:
-    """A single log entry from a pipeline run."""
+    """A single log entry from a pipeline run.
+
+    Slotted: a run buffers up to _MAX_LOG_ENTRIES of these, so dropping the
+    per-instance __dict__ keeps the deque's footprint down.
+    """
 
     timestamp: float  # time.time()
     level: str  # "info", "warn", "error", "debug"
@@ -73,11 +77,14 @@ class RunState:
     quality_results: list[QualityTestResult] = field(default_factory=list)
     archived_zones: list[str] = field(default_factory=list)
     cancel_event: threading.Event = field(default_factory=threading.Event)
-    logs: deque[LogRecord] = field(default_factory=lambda: deque(maxlen=_MAX_LOG_ENTRIES))
+    # Capacity of the log deque below; the oldest records are evicted past it.
+    max_log_records: int = _MAX_LOG_ENTRIES
+    logs: deque[LogRecord] = field(init=False)
     _lock: threading.Lock = field(default_factory=threading.Lock)
     _log_condition: threading.Condition = field(init=False)
 
     def __post_init__(self) -> None:
+        self.logs = deque(maxlen=self.max_log_records)
         # Condition wraps the existing lock so add_log + StreamLogs share state.
         self._log_condition = threading.Condition(self._lock)
 
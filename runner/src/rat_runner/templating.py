@@ -19,6 +19,15 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import: extract_metadata and the compile_sql comment strip run
+# these per source line, and validate_template runs on every pipeline compile.
+_METADATA_LINE = re.compile(r"^(?:--|#)\s*@(\w+):\s*(.+)$")
+_METADATA_PREFIX = re.compile(r"^\s*(?:--|#)\s*@\w+:")
+_REF_CALL = re.compile(r"""ref\(\s*['"]([^'"]+)['"]\s*\)""")
+_LANDING_ZONE_CALL = re.compile(r"""landing_zone\(\s*['"]([^'"]+)['"]\s*\)""")
+_NESTED_JINJA_CALL = re.compile(r"""(?:ref|landing_zone)\(\s*['"].*\{\{.*\}\}.*['"]\s*\)""")
+_BARE_CALL = re.compile(r"""(?:ref|landing_zone)\(\s*['"][^'"]+['"]\s*\)""")
+
 
 def extract_metadata(source: str) -> dict[str, str]:
     """Parse @key: value metadata headers from SQL (--) or Python (#) comments.
@@ -30,7 +39,7 @@ def extract_metadata(source: str) -> dict[str, str]:
     metadata: dict[str, str] = {}
     for line in source.splitlines():
         stripped = line.strip()
-        match = re.match(r"^(?:--|#)\s*@(\w+):\s*(.+)$", stripped)
+        match = _METADATA_LINE.match(stripped)
         if match:
             metadata[match.group(1)] = match.group(2).strip()
         elif stripped and not stripped.startswith("--") and not stripped.startswith("#"):
@@ -59,12 +68,12 @@ def metadata_to_config(metadata: dict[str, str]) -> PipelineConfig:
 
 def extract_dependencies(sql: str) -> list[str]:
     """Extract ref('...') table references from SQL."""
-    return re.findall(r"""ref\(\s*['"]([^'"]+)['"]\s*\)""", sql)
+    return _REF_CALL.findall(sql)
 
 
 def extract_landing_zones(sql: str) -> list[str]:
     """Extract landing_zone('...') references from SQL."""
-    return re.findall(r"""landing_zone\(\s*['"]([^'"]+)['"]\s*\)""", sql)
+    return _LANDING_ZONE_CALL.findall(sql)
 
 
 def compile_sql(
@@ -146,7 +155,7 @@ def compile_sql(
     lines = rendered.splitlines()
     output_lines: list[str] = []
     for line in lines:
-        if re.match(r"^\s*(?:--|#)\s*@\w+:", line):
+        if _METADATA_PREFIX.match(line):
             continue
         output_lines.append(line)
 
@@ -261,15 +270,13 @@ def validate_template(raw_sql: str) -> tuple[list[str], list[str]]:
         return errors, warnings
 
     # 2. Detect nested Jinja inside function calls — e.g. ref('{{this}}')
-    nested_pattern = re.compile(r"""(?:ref|landing_zone)\(\s*['"].*\{\{.*\}\}.*['"]\s*\)""")
-    for match in nested_pattern.finditer(raw_sql):
+    for match in _NESTED_JINJA_CALL.finditer(raw_sql):
         errors.append(f"Nested Jinja inside function call: {match.group()}")
 
     # 3. Bare ref() or landing_zone() outside {{ }} delimiters
     # Find all ref(...) and landing_zone(...) calls, then check if they're inside
     # {{ }}, {% %}, or SQL comments (-- or /* */).
-    bare_pattern = re.compile(r"""(?:ref|landing_zone)\(\s*['"][^'"]+['"]\s*\)""")
-    for match in bare_pattern.finditer(raw_sql):
+    for match in _BARE_CALL.finditer(raw_sql):
         start = match.start()
 
         # Skip matches inside SQL line comments (-- ...)
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import sys
+from collections.abc import Callable
 from pathlib import Path
+from unittest.mock import Mock
 
+import duckdb
 import pytest
 
 from rat_runner.config import NessieConfig, S3Config, _boto3_client_cache_clear
@@ -23,8 +26,9 @@ def _clear_boto3_cache():
     _boto3_client_cache_clear()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def s3_config() -> S3Config:
+    """One instance per session (per xdist worker) — S3Config is frozen, so tests cannot mutate it."""
     return S3Config(
         endpoint="localhost:9000",
         access_key="test-access-key",
@@ -34,6 +38,17 @@ def s3_config() -> S3Config:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def nessie_config() -> NessieConfig:
+    """One instance per session, like s3_config — NessieConfig is frozen too."""
     return NessieConfig(url="http://localhost:19120/api/v1")
+
+
+@pytest.fixture
+def mock_conn_factory() -> Callable[[], Mock]:
+    """Return a factory for DuckDB connection mocks.
+
+    spec_set restricts the mock to the real DuckDBPyConnection API, so a typo'd
+    method fails loudly instead of silently returning a child mock.
+    """
+    return lambda: Mock(spec_set=duckdb.DuckDBPyConnection)
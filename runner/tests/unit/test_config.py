@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import functools
 import logging
-import time
-from unittest.mock import MagicMock, patch
+from collections.abc import Mapping
+from types import MappingProxyType
+from unittest.mock import MagicMock, call
 
 import pytest
 from botocore.exceptions import ClientError
@@ -23,12 +25,93 @@ from rat_runner.config import (
     read_s3_text,
     validate_pipeline_config,
 )
-from rat_runner.models import MergeStrategy, PipelineConfig
+from rat_runner.models import MergeStrategy, PartitionByEntry, PipelineConfig
+
+
+@functools.cache
+def _parse(yaml_str: str) -> PipelineConfig:
+    """Memoized parse_pipeline_config for tests that don't inspect warnings.
+
+    PipelineConfig is frozen, so sharing the parsed result between tests is
+    safe. Tests asserting on log output call parse_pipeline_config directly —
+    a cache hit would skip the warning.
+    """
+    return parse_pipeline_config(yaml_str)
+
+
+# Every variable read by the Config.from_env() constructors under test.
+_CONFIG_ENV_KEYS = (
+    "S3_ENDPOINT",
+    "S3_ACCESS_KEY",
+    "S3_SECRET_KEY",
+    "S3_BUCKET",
+    "S3_USE_SSL",
+    "S3_SESSION_TOKEN",
+    "S3_REGION",
+    "NESSIE_URL",
+    "DUCKDB_MEMORY_LIMIT",
+    "DUCKDB_THREADS",
+    "QUERY_TIMEOUT_SECS",
+    "QUALITY_TEST_TIMEOUT_SECS",
+)
+
+
+# Shared from_env inputs, built once at import. Read-only so no test can leak
+# a mutation into another.
+_CREDENTIALS_ENV: Mapping[str, str] = MappingProxyType(
+    {"S3_ACCESS_KEY": "ak", "S3_SECRET_KEY": "sk"}
+)
+_CUSTOM_S3_ENV: Mapping[str, str] = MappingProxyType(
+    {
+        "S3_ENDPOINT": "custom:9000",
+        "S3_ACCESS_KEY": "key",
+        "S3_SECRET_KEY": "secret",
+        "S3_BUCKET": "mybucket",
+        "S3_USE_SSL": "true",
+    }
+)
+_SESSION_TOKEN_ENV: Mapping[str, str] = MappingProxyType(
+    {
+        "S3_ENDPOINT": "minio:9000",
+        "S3_ACCESS_KEY": "test-key",
+        "S3_SECRET_KEY": "test-secret",
+        "S3_SESSION_TOKEN": "sts-token-abc",
+    }
+)
+_CUSTOM_DUCKDB_ENV: Mapping[str, str] = MappingProxyType(
+    {"DUCKDB_MEMORY_LIMIT": "4GB", "DUCKDB_THREADS": "8"}
+)
+
+
+def _use_env(monkeypatch: pytest.MonkeyPatch, env: Mapping[str, str]) -> None:
+    """Make the config variables in os.environ match exactly ``env``.
+
+    monkeypatch only snapshots the keys it touches, unlike
+    patch.dict(os.environ, clear=True) which copies the whole environment.
+    """
+    for key in _CONFIG_ENV_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+
+
+@pytest.fixture
+def mock_boto(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace boto3.client in rat_runner.config; tests wire its return_value."""
+    mock = MagicMock()
+    monkeypatch.setattr("rat_runner.config.boto3.client", mock)
+    return mock
+
+
+@pytest.fixture(scope="class")
+def default_config() -> S3Config:
+    """S3Config is frozen, so one default instance is safe to share."""
+    return S3Config()
 
 
 class TestS3Config:
-    def test_defaults(self):
-        config = S3Config()
+    def test_defaults(self, default_config: S3Config):
+        config = default_config
         assert config.endpoint == "minio:9000"
         assert config.access_key == ""
         assert config.secret_key == ""
@@ -43,49 +126,40 @@ class TestS3Config:
         config = S3Config(endpoint="s3.amazonaws.com", use_ssl=True)
         assert config.endpoint_url == "https://s3.amazonaws.com"
 
-    def test_from_env_raises_without_credentials(self):
-        with patch.dict("os.environ", {}, clear=True):
-            with pytest.raises(ValueError, match="S3_ACCESS_KEY and S3_SECRET_KEY"):
-                S3Config.from_env()
-
-    def test_from_env_raises_without_secret_key(self):
-        with patch.dict("os.environ", {"S3_ACCESS_KEY": "key"}, clear=True):
-            with pytest.raises(ValueError, match="S3_ACCESS_KEY and S3_SECRET_KEY"):
-                S3Config.from_env()
-
-    def test_from_env_raises_without_access_key(self):
-        with patch.dict("os.environ", {"S3_SECRET_KEY": "secret"}, clear=True):
-            with pytest.raises(ValueError, match="S3_ACCESS_KEY and S3_SECRET_KEY"):
-                S3Config.from_env()
-
-    def test_from_env_defaults(self):
-        env = {"S3_ACCESS_KEY": "ak", "S3_SECRET_KEY": "sk"}
-        with patch.dict("os.environ", env, clear=True):
-            config = S3Config.from_env()
+    def test_from_env_raises_without_credentials(self, monkeypatch: pytest.MonkeyPatch):
+        _use_env(monkeypatch, {})
+        with pytest.raises(ValueError, match="S3_ACCESS_KEY and S3_SECRET_KEY"):
+            S3Config.from_env()
+
+    def test_from_env_raises_without_secret_key(self, monkeypatch: pytest.MonkeyPatch):
+        _use_env(monkeypatch, {"S3_ACCESS_KEY": "key"})
+        with pytest.raises(ValueError, match="S3_ACCESS_KEY and S3_SECRET_KEY"):
+            S3Config.from_env()
+
+    def test_from_env_raises_without_access_key(self, monkeypatch: pytest.MonkeyPatch):
+        _use_env(monkeypatch, {"S3_SECRET_KEY": "secret"})
+        with pytest.raises(ValueError, match="S3_ACCESS_KEY and S3_SECRET_KEY"):
+            S3Config.from_env()
+
+    def test_from_env_defaults(self, monkeypatch: pytest.MonkeyPatch):
+        _use_env(monkeypatch, _CREDENTIALS_ENV)
+        config = S3Config.from_env()
         assert config.endpoint == "minio:9000"
         assert config.bucket == "rat"
         assert config.access_key == "ak"
         assert config.secret_key == "sk"
 
-    def test_from_env_custom(self):
-        env = {
-            "S3_ENDPOINT": "custom:9000",
-            "S3_ACCESS_KEY": "key",
-            "S3_SECRET_KEY": "secret",
-            "S3_BUCKET": "mybucket",
-            "S3_USE_SSL": "true",
-        }
-        with patch.dict("os.environ", env, clear=True):
-            config = S3Config.from_env()
+    def test_from_env_custom(self, monkeypatch: pytest.MonkeyPatch):
+        _use_env(monkeypatch, _CUSTOM_S3_ENV)
+        config = S3Config.from_env()
         assert config.endpoint == "custom:9000"
         assert config.access_key == "key"
         assert config.secret_key == "secret"
         assert config.bucket == "mybucket"
         assert config.use_ssl is True
 
-    def test_with_overrides_full(self):
-        config = S3Config()
-        overridden = config.with_overrides(
+    def test_with_overrides_full(self, default_config: S3Config):
+        overridden = default_config.with_overrides(
             {
                 "endpoint": "sts:9000",
                 "access_key": "AKIA...",
@@ -100,10 +174,9 @@ class TestS3Config:
         assert overridden.bucket == "other"
         assert overridden.use_ssl is True
 
-    def test_with_overrides_empty_returns_self(self):
-        config = S3Config()
-        result = config.with_overrides({})
-        assert result is config
+    def test_with_overrides_empty_returns_self(self, default_config: S3Config):
+        result = default_config.with_overrides({})
+        assert result is default_config
 
     def test_with_overrides_partial(self):
         config = S3Config(endpoint="orig:9000", access_key="orig_key")
@@ -111,33 +184,21 @@ class TestS3Config:
         assert overridden.endpoint == "orig:9000"
         assert overridden.access_key == "new_key"
 
-    def test_session_token_default_empty(self):
-        config = S3Config()
-        assert config.session_token == ""
+    def test_session_token_default_empty(self, default_config: S3Config):
+        assert default_config.session_token == ""
 
-    def test_from_env_reads_session_token(self):
-        env = {
-            "S3_ENDPOINT": "minio:9000",
-            "S3_ACCESS_KEY": "test-key",
-            "S3_SECRET_KEY": "test-secret",
-            "S3_SESSION_TOKEN": "sts-token-abc",
-        }
-        with patch.dict("os.environ", env, clear=True):
-            config = S3Config.from_env()
+    def test_from_env_reads_session_token(self, monkeypatch: pytest.MonkeyPatch):
+        _use_env(monkeypatch, _SESSION_TOKEN_ENV)
+        config = S3Config.from_env()
         assert config.session_token == "sts-token-abc"
 
-    def test_from_env_session_token_empty_when_not_set(self):
-        env = {
-            "S3_ACCESS_KEY": "test-key",
-            "S3_SECRET_KEY": "test-secret",
-        }
-        with patch.dict("os.environ", env, clear=True):
-            config = S3Config.from_env()
+    def test_from_env_session_token_empty_when_not_set(self, monkeypatch: pytest.MonkeyPatch):
+        _use_env(monkeypatch, _CREDENTIALS_ENV)
+        config = S3Config.from_env()
         assert config.session_token == ""
 
-    def test_with_overrides_session_token(self):
-        config = S3Config()
-        overridden = config.with_overrides({"session_token": "sts-xyz"})
+    def test_with_overrides_session_token(self, default_config: S3Config):
+        overridden = default_config.with_overrides({"session_token": "sts-xyz"})
         assert overridden.session_token == "sts-xyz"
 
     def test_with_overrides_preserves_session_token(self):
@@ -146,25 +207,37 @@ class TestS3Config:
         assert overridden.session_token == "existing-token"
 
 
+# These tests share the module-level boto3 client cache, so under
+# `pytest -n auto --dist loadgroup` they run together on a single worker.
+@pytest.mark.xdist_group("boto3_cache")
 class TestBoto3Client:
-    def test_no_session_token(self):
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        """Start and end every test with an empty client cache.
+
+        These tests assert on exact cache contents, so they must not depend on
+        entries left behind by other tests (or on conftest ordering).
+        """
+        _boto3_client_cache_clear()
+        yield
+        _boto3_client_cache_clear()
+
+    def test_no_session_token(self, mock_boto: MagicMock):
         config = S3Config(endpoint="minio:9000", access_key="ak", secret_key="sk")
-        with patch("rat_runner.config.boto3.client") as mock_client:
-            _boto3_client(config)
-        mock_client.assert_called_once_with(
+        _boto3_client(config)
+        mock_boto.assert_called_once_with(
             "s3",
             endpoint_url="http://minio:9000",
             aws_access_key_id="ak",
             aws_secret_access_key="sk",
         )
 
-    def test_with_session_token(self):
+    def test_with_session_token(self, mock_boto: MagicMock):
         config = S3Config(
             endpoint="minio:9000", access_key="ak", secret_key="sk", session_token="tok"
         )
-        with patch("rat_runner.config.boto3.client") as mock_client:
-            _boto3_client(config)
-        mock_client.assert_called_once_with(
+        _boto3_client(config)
+        mock_boto.assert_called_once_with(
             "s3",
             endpoint_url="http://minio:9000",
             aws_access_key_id="ak",
@@ -172,90 +245,84 @@ class TestBoto3Client:
             aws_session_token="tok",
         )
 
-    def test_returns_cached_client_within_ttl(self):
+    def test_returns_cached_client_within_ttl(self, mock_boto: MagicMock):
         config = S3Config(endpoint="minio:9000", access_key="ak", secret_key="sk")
-        with patch("rat_runner.config.boto3.client") as mock_client:
-            client1 = _boto3_client(config)
-            client2 = _boto3_client(config)
+        client1 = _boto3_client(config)
+        client2 = _boto3_client(config)
         assert client1 is client2
         # boto3.client should only be called once — second call returns cached
-        mock_client.assert_called_once()
+        mock_boto.assert_called_once()
 
-    def test_creates_new_client_after_ttl_expires(self):
+    def test_creates_new_client_after_ttl_expires(
+        self, mock_boto: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ):
         config = S3Config(endpoint="minio:9000", access_key="ak", secret_key="sk")
-        with patch("rat_runner.config.boto3.client") as mock_client:
-            mock_client.side_effect = [MagicMock(name="client1"), MagicMock(name="client2")]
+        mock_boto.side_effect = [MagicMock(name="client1"), MagicMock(name="client2")]
 
-            client1 = _boto3_client(config)
+        monkeypatch.setattr("rat_runner.config._now", lambda: 1000.0)
+        client1 = _boto3_client(config)
 
-            # Simulate TTL expiry by backdating the cached timestamp
-            _boto3_client_cache[config] = (
-                _boto3_client_cache[config][0],
-                time.monotonic() - _BOTO3_CLIENT_TTL_SECONDS - 1,
-            )
-
-            client2 = _boto3_client(config)
+        # Advance the clock just past the TTL
+        monkeypatch.setattr(
+            "rat_runner.config._now", lambda: 1000.0 + _BOTO3_CLIENT_TTL_SECONDS + 1
+        )
+        client2 = _boto3_client(config)
 
         assert client1 is not client2
-        assert mock_client.call_count == 2
+        assert mock_boto.call_count == 2
 
     def test_ttl_is_45_minutes(self):
         assert _BOTO3_CLIENT_TTL_SECONDS == 45 * 60
 
-    def test_cache_clear_removes_all_entries(self):
+    def test_cache_clear_removes_all_entries(self, mock_boto: MagicMock):
         config = S3Config(endpoint="minio:9000", access_key="ak", secret_key="sk")
-        with patch("rat_runner.config.boto3.client"):
-            _boto3_client(config)
-        assert len(_boto3_client_cache) == 1
+        _boto3_client(config)
+        assert config in _boto3_client_cache
         _boto3_client_cache_clear()
-        assert len(_boto3_client_cache) == 0
+        assert _boto3_client_cache == {}
 
-    def test_different_configs_cached_separately(self):
+    def test_different_configs_cached_separately(self, mock_boto: MagicMock):
         config1 = S3Config(endpoint="minio:9000", access_key="ak1", secret_key="sk1")
         config2 = S3Config(endpoint="minio:9000", access_key="ak2", secret_key="sk2")
-        with patch("rat_runner.config.boto3.client") as mock_client:
-            mock_client.side_effect = [MagicMock(name="client1"), MagicMock(name="client2")]
-            client1 = _boto3_client(config1)
-            client2 = _boto3_client(config2)
+        mock_boto.side_effect = [MagicMock(name="client1"), MagicMock(name="client2")]
+        client1 = _boto3_client(config1)
+        client2 = _boto3_client(config2)
         assert client1 is not client2
-        assert mock_client.call_count == 2
+        assert mock_boto.call_count == 2
         assert len(_boto3_client_cache) == 2
 
 
 class TestNessieConfig:
-    def test_base_url_strips_api_v1(self):
-        config = NessieConfig(url="http://nessie:19120/api/v1")
-        assert config.base_url == "http://nessie:19120/iceberg"
-
-    def test_base_url_strips_api_v2(self):
-        config = NessieConfig(url="http://nessie:19120/api/v2")
-        assert config.base_url == "http://nessie:19120/iceberg"
-
-    def test_base_url_no_suffix(self):
-        config = NessieConfig(url="http://nessie:19120")
-        assert config.base_url == "http://nessie:19120/iceberg"
-
-    def test_base_url_strips_trailing_slash(self):
-        config = NessieConfig(url="http://nessie:19120/api/v1/")
-        assert config.base_url == "http://nessie:19120/iceberg"
-
-    def test_from_env_default(self):
-        with patch.dict("os.environ", {}, clear=True):
-            config = NessieConfig.from_env()
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://nessie:19120/api/v1",
+            "http://nessie:19120/api/v2",
+            "http://nessie:19120",
+            "http://nessie:19120/api/v1/",
+            "http://nessie:19120/iceberg",
+        ],
+        ids=["strips_api_v1", "strips_api_v2", "no_suffix", "strips_trailing_slash", "iceberg"],
+    )
+    def test_base_url(self, url: str):
+        assert NessieConfig(url=url).base_url == "http://nessie:19120/iceberg"
+
+    def test_from_env_default(self, monkeypatch: pytest.MonkeyPatch):
+        _use_env(monkeypatch, {})
+        config = NessieConfig.from_env()
         assert config.url == "http://nessie:19120/api/v1"
 
-    def test_api_v2_url(self):
-        config = NessieConfig(url="http://nessie:19120/api/v1")
-        assert config.api_v2_url == "http://nessie:19120/api/v2"
-
-    def test_api_v2_url_no_suffix(self):
-        config = NessieConfig(url="http://nessie:19120")
-        assert config.api_v2_url == "http://nessie:19120/api/v2"
-
-    def test_api_v2_url_from_iceberg_suffix(self):
-        config = NessieConfig(url="http://nessie:19120/iceberg")
-        assert config.api_v2_url == "http://nessie:19120/api/v2"
-        assert config.base_url == "http://nessie:19120/iceberg"
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://nessie:19120/api/v1",
+            "http://nessie:19120",
+            "http://nessie:19120/iceberg",
+        ],
+        ids=["from_api_v1", "no_suffix", "from_iceberg_suffix"],
+    )
+    def test_api_v2_url(self, url: str):
+        assert NessieConfig(url=url).api_v2_url == "http://nessie:19120/api/v2"
 
 
 class TestDuckDBConfig:
@@ -266,59 +333,81 @@ class TestDuckDBConfig:
         assert config.memory_limit == "2GB"
         assert config.threads == 4
 
-    def test_from_env_defaults(self):
+    def test_from_env_defaults(self, monkeypatch: pytest.MonkeyPatch):
         from rat_runner.config import DuckDBConfig
 
-        with patch.dict("os.environ", {}, clear=True):
-            config = DuckDBConfig.from_env()
+        _use_env(monkeypatch, {})
+        config = DuckDBConfig.from_env()
         assert config.memory_limit == "2GB"
         assert config.threads == 4
 
-    def test_from_env_custom(self):
+    def test_from_env_custom(self, monkeypatch: pytest.MonkeyPatch):
         from rat_runner.config import DuckDBConfig
 
-        env = {"DUCKDB_MEMORY_LIMIT": "4GB", "DUCKDB_THREADS": "8"}
-        with patch.dict("os.environ", env, clear=True):
-            config = DuckDBConfig.from_env()
+        _use_env(monkeypatch, _CUSTOM_DUCKDB_ENV)
+        config = DuckDBConfig.from_env()
         assert config.memory_limit == "4GB"
         assert config.threads == 8
 
-    def test_from_env_rejects_zero_threads(self):
+    def test_from_env_rejects_zero_threads(self, monkeypatch: pytest.MonkeyPatch):
         from rat_runner.config import DuckDBConfig
 
         env = {"DUCKDB_THREADS": "0"}
-        with patch.dict("os.environ", env, clear=True):
-            with pytest.raises(ValueError, match="positive integer"):
-                DuckDBConfig.from_env()
+        _use_env(monkeypatch, env)
+        with pytest.raises(ValueError, match="positive integer"):
+            DuckDBConfig.from_env()
 
-    def test_from_env_rejects_negative_threads(self):
+    def test_from_env_rejects_negative_threads(self, monkeypatch: pytest.MonkeyPatch):
         from rat_runner.config import DuckDBConfig
 
         env = {"DUCKDB_THREADS": "-2"}
-        with patch.dict("os.environ", env, clear=True):
-            with pytest.raises(ValueError, match="positive integer"):
-                DuckDBConfig.from_env()
+        _use_env(monkeypatch, env)
+        with pytest.raises(ValueError, match="positive integer"):
+            DuckDBConfig.from_env()
 
-    def test_from_env_rejects_non_numeric_threads(self):
+    def test_from_env_rejects_non_numeric_threads(self, monkeypatch: pytest.MonkeyPatch):
         from rat_runner.config import DuckDBConfig
 
         env = {"DUCKDB_THREADS": "auto"}
-        with patch.dict("os.environ", env, clear=True):
-            with pytest.raises(ValueError, match="valid integer"):
-                DuckDBConfig.from_env()
+        _use_env(monkeypatch, env)
+        with pytest.raises(ValueError, match="valid integer"):
+            DuckDBConfig.from_env()
 
-    def test_from_env_rejects_float_threads(self):
+    def test_from_env_rejects_float_threads(self, monkeypatch: pytest.MonkeyPatch):
         from rat_runner.config import DuckDBConfig
 
         env = {"DUCKDB_THREADS": "2.5"}
-        with patch.dict("os.environ", env, clear=True):
-            with pytest.raises(ValueError, match="valid integer"):
-                DuckDBConfig.from_env()
+        _use_env(monkeypatch, env)
+        with pytest.raises(ValueError, match="valid integer"):
+            DuckDBConfig.from_env()
+
+
+_MULTIPLE_PARTITIONS_YAML = """
+partition_by:
+  - column: created_date
+    transform: month
+  - column: region
+    transform: identity
+"""
+
+_ALL_TRANSFORMS_YAML = """
+partition_by:
+  - column: ts
+    transform: identity
+  - column: ts
+    transform: day
+  - column: ts
+    transform: month
+  - column: ts
+    transform: year
+  - column: ts
+    transform: hour
+"""
 
 
 class TestParsePipelineConfig:
     def test_minimal_yaml(self):
-        config = parse_pipeline_config("description: My pipeline")
+        config = _parse("description: My pipeline")
         assert config.description == "My pipeline"
         assert config.materialized == "table"
 
@@ -331,31 +420,31 @@ unique_key:
   - product_id
 merge_strategy: incremental
 """
-        config = parse_pipeline_config(yaml_str)
+        config = _parse(yaml_str)
         assert config.description == "Order cleanup"
         assert config.materialized == "table"
         assert config.unique_key == ("order_id", "product_id")
         assert config.merge_strategy == "incremental"
 
     def test_unique_key_as_csv_string(self):
-        config = parse_pipeline_config("unique_key: order_id, product_id")
+        config = _parse("unique_key: order_id, product_id")
         assert config.unique_key == ("order_id", "product_id")
 
     def test_invalid_yaml_returns_defaults(self):
-        config = parse_pipeline_config("just a string")
+        config = _parse("just a string")
         assert config.description == ""
         assert config.unique_key == ()
 
     def test_watermark_column(self):
-        config = parse_pipeline_config("watermark_column: updated_at")
+        config = _parse("watermark_column: updated_at")
         assert config.watermark_column == "updated_at"
 
     def test_watermark_column_default_empty(self):
-        config = parse_pipeline_config("description: test")
+        config = _parse("description: test")
         assert config.watermark_column == ""
 
     def test_partition_column(self):
-        config = parse_pipeline_config("partition_column: date")
+        config = _parse("partition_column: date")
         assert config.partition_column == "date"
 
     def test_scd_columns(self):
@@ -363,84 +452,52 @@ merge_strategy: incremental
 scd_valid_from: start_ts
 scd_valid_to: end_ts
 """
-        config = parse_pipeline_config(yaml_str)
+        config = _parse(yaml_str)
         assert config.scd_valid_from == "start_ts"
         assert config.scd_valid_to == "end_ts"
 
     def test_scd_columns_default(self):
-        config = parse_pipeline_config("description: test")
+        config = _parse("description: test")
         assert config.scd_valid_from == "valid_from"
         assert config.scd_valid_to == "valid_to"
 
-    def test_new_strategies_parsed(self):
-        for strategy in ("append_only", "delete_insert", "scd2", "snapshot"):
-            config = parse_pipeline_config(f"merge_strategy: {strategy}")
-            assert config.merge_strategy == strategy
-
-    def test_partition_by_single_entry(self):
-        yaml_str = """
-partition_by:
-  - column: created_date
-    transform: day
-"""
-        config = parse_pipeline_config(yaml_str)
-        assert len(config.partition_by) == 1
-        assert config.partition_by[0].column == "created_date"
-        assert config.partition_by[0].transform == "day"
-
-    def test_partition_by_multiple_entries(self):
-        yaml_str = """
-partition_by:
-  - column: created_date
-    transform: month
-  - column: region
-    transform: identity
-"""
-        config = parse_pipeline_config(yaml_str)
-        assert len(config.partition_by) == 2
-        assert config.partition_by[0].column == "created_date"
-        assert config.partition_by[0].transform == "month"
-        assert config.partition_by[1].column == "region"
-        assert config.partition_by[1].transform == "identity"
-
-    def test_partition_by_defaults_to_identity(self):
-        yaml_str = """
-partition_by:
-  - column: region
-"""
-        config = parse_pipeline_config(yaml_str)
-        assert len(config.partition_by) == 1
-        assert config.partition_by[0].transform == "identity"
-
-    def test_partition_by_empty_list(self):
-        yaml_str = """
-partition_by: []
-"""
-        config = parse_pipeline_config(yaml_str)
-        assert config.partition_by == ()
-
-    def test_partition_by_not_set(self):
-        config = parse_pipeline_config("description: test")
-        assert config.partition_by == ()
-
-    def test_partition_by_all_transforms(self):
-        yaml_str = """
-partition_by:
-  - column: ts
-    transform: identity
-  - column: ts
-    transform: day
-  - column: ts
-    transform: month
-  - column: ts
-    transform: year
-  - column: ts
-    transform: hour
-"""
-        config = parse_pipeline_config(yaml_str)
-        assert len(config.partition_by) == 5
-        transforms = [e.transform for e in config.partition_by]
-        assert transforms == ["identity", "day", "month", "year", "hour"]
+    @pytest.mark.parametrize("strategy", ["append_only", "delete_insert", "scd2", "snapshot"])
+    def test_new_strategies_parsed(self, strategy: str):
+        config = _parse(f"merge_strategy: {strategy}")
+        assert config.merge_strategy == strategy
+
+    @pytest.mark.parametrize(
+        ("yaml_str", "expected"),
+        [
+            (
+                "partition_by:\n  - column: created_date\n    transform: day\n",
+                (PartitionByEntry("created_date", "day"),),
+            ),
+            (
+                _MULTIPLE_PARTITIONS_YAML,
+                (PartitionByEntry("created_date", "month"), PartitionByEntry("region", "identity")),
+            ),
+            ("partition_by:\n  - column: region\n", (PartitionByEntry("region", "identity"),)),
+            ("partition_by: []", ()),
+            ("description: test", ()),
+            (
+                _ALL_TRANSFORMS_YAML,
+                tuple(
+                    PartitionByEntry("ts", t) for t in ("identity", "day", "month", "year", "hour")
+                ),
+            ),
+        ],
+        ids=[
+            "single_entry",
+            "multiple_entries",
+            "defaults_to_identity",
+            "empty_list",
+            "not_set",
+            "all_transforms",
+        ],
+    )
+    def test_partition_by(self, yaml_str: str, expected: tuple[PartitionByEntry, ...]):
+        assert _parse(yaml_str).partition_by == expected
 
 
 class TestValidatePartitionBy:
@@ -450,24 +507,24 @@ class TestValidatePartitionBy:
         data = {"partition_by": [{"column": "date", "transform": "day"}]}
         validate_pipeline_config(data)  # should not raise
 
-    def test_partition_by_not_a_list_raises(self):
-        data = {"partition_by": "date"}
-        with pytest.raises(ValueError, match="partition_by must be a list"):
-            validate_pipeline_config(data)
-
-    def test_partition_by_entry_not_a_dict_raises(self):
-        data = {"partition_by": ["date"]}
-        with pytest.raises(ValueError, match="partition_by\\[0\\] must be a mapping"):
-            validate_pipeline_config(data)
-
-    def test_partition_by_entry_missing_column_raises(self):
-        data = {"partition_by": [{"transform": "day"}]}
-        with pytest.raises(ValueError, match="partition_by\\[0\\] is missing required 'column'"):
-            validate_pipeline_config(data)
-
-    def test_partition_by_invalid_transform_raises(self):
-        data = {"partition_by": [{"column": "date", "transform": "bucket[16]"}]}
-        with pytest.raises(ValueError, match="Invalid partition transform 'bucket\\[16\\]'"):
+    @pytest.mark.parametrize(
+        ("data", "pattern"),
+        [
+            ({"partition_by": "date"}, "partition_by must be a list"),
+            ({"partition_by": ["date"]}, r"partition_by\[0\] must be a mapping"),
+            (
+                {"partition_by": [{"transform": "day"}]},
+                r"partition_by\[0\] is missing required 'column'",
+            ),
+            (
+                {"partition_by": [{"column": "date", "transform": "bucket[16]"}]},
+                r"Invalid partition transform 'bucket\[16\]'",
+            ),
+        ],
+        ids=["not_a_list", "entry_not_a_dict", "entry_missing_column", "invalid_transform"],
+    )
+    def test_partition_by_invalid_raises(self, data: dict[str, object], pattern: str):
+        with pytest.raises(ValueError, match=pattern):
             validate_pipeline_config(data)
 
     def test_partition_by_default_transform_is_valid(self):
@@ -480,40 +537,46 @@ class TestValidatePartitionBy:
         validate_pipeline_config({"description": "no partitions"})
 
 
+# One value for every known config key. Shared across tests — validate_pipeline_config
+# only reads its input.
+_ALL_KNOWN_CONFIG: dict[str, object] = {
+    "description": "test",
+    "materialized": "table",
+    "unique_key": ["id"],
+    "merge_strategy": "full_refresh",
+    "watermark_column": "updated_at",
+    "archive_landing_zones": True,
+    "partition_column": "date",
+    "partition_by": [{"column": "date", "transform": "day"}],
+    "scd_valid_from": "start_ts",
+    "scd_valid_to": "end_ts",
+}
+
+
 class TestValidatePipelineConfig:
     """Tests for validate_pipeline_config — unknown key warnings and value validation."""
 
+    @pytest.fixture(autouse=True)
+    def _capture_warnings(self, caplog: pytest.LogCaptureFixture):
+        """Capture rat_runner.config warnings for every test in the class."""
+        caplog.set_level(logging.WARNING, logger="rat_runner.config")
+
     def test_known_keys_no_warnings(self, caplog):
         """All known keys should pass without warnings."""
-        data = {
-            "description": "test",
-            "materialized": "table",
-            "unique_key": ["id"],
-            "merge_strategy": "full_refresh",
-            "watermark_column": "updated_at",
-            "archive_landing_zones": True,
-            "partition_column": "date",
-            "partition_by": [{"column": "date", "transform": "day"}],
-            "scd_valid_from": "start_ts",
-            "scd_valid_to": "end_ts",
-        }
-        with caplog.at_level(logging.WARNING, logger="rat_runner.config"):
-            validate_pipeline_config(data)
+        validate_pipeline_config(_ALL_KNOWN_CONFIG)
         assert len(caplog.records) == 0
 
     def test_unknown_key_warns(self, caplog):
         """Unknown keys should produce a warning, not an error."""
         data = {"description": "test", "typo_key": "value"}
-        with caplog.at_level(logging.WARNING, logger="rat_runner.config"):
-            validate_pipeline_config(data)
+        validate_pipeline_config(data)
         assert len(caplog.records) == 1
         assert "Unknown pipeline config key 'typo_key'" in caplog.records[0].message
 
     def test_multiple_unknown_keys_warn_sorted(self, caplog):
         """Multiple unknown keys should each produce a warning, in sorted order."""
         data = {"zebra": 1, "aardvark": 2, "description": "ok"}
-        with caplog.at_level(logging.WARNING, logger="rat_runner.config"):
-            validate_pipeline_config(data)
+        validate_pipeline_config(data)
         assert len(caplog.records) == 2
         assert "aardvark" in caplog.records[0].message
         assert "zebra" in caplog.records[1].message
@@ -524,10 +587,10 @@ class TestValidatePipelineConfig:
         with pytest.raises(ValueError, match="Invalid merge_strategy 'upsert'"):
             validate_pipeline_config(data)
 
-    def test_all_valid_merge_strategies_accepted(self):
+    @pytest.mark.parametrize("strategy", list(MergeStrategy))
+    def test_all_valid_merge_strategies_accepted(self, strategy: MergeStrategy):
         """Every strategy in MergeStrategy should be accepted."""
-        for strategy in MergeStrategy:
-            validate_pipeline_config({"merge_strategy": strategy})
+        validate_pipeline_config({"merge_strategy": strategy})
 
     def test_plugin_strategy_accepted_via_known_strategies(self):
         """A non-built-in strategy is accepted when passed in known_strategies."""
@@ -591,8 +654,7 @@ class TestValidatePipelineConfig:
 description: My pipeline
 unknown_option: true
 """
-        with caplog.at_level(logging.WARNING, logger="rat_runner.config"):
-            config = parse_pipeline_config(yaml_str)
+        config = parse_pipeline_config(yaml_str)
         assert config.description == "My pipeline"
         assert len(caplog.records) == 1
         assert "unknown_option" in caplog.records[0].message
@@ -607,6 +669,9 @@ unknown_option: true
         validate_pipeline_config({})
 
 
+_DEFAULT_PIPELINE_CONFIG = PipelineConfig()
+
+
 class TestMergeConfigs:
     def test_annotations_win_over_base(self):
         base = PipelineConfig(merge_strategy="full_refresh", description="base")
@@ -625,7 +690,7 @@ class TestMergeConfigs:
 
     def test_both_none(self):
         result = merge_configs(None, {})
-        assert result == PipelineConfig()
+        assert result == _DEFAULT_PIPELINE_CONFIG
 
     def test_unique_key_from_annotation(self):
         base = PipelineConfig(unique_key=("old_key",))
@@ -657,121 +722,129 @@ class TestMergeConfigs:
         assert result.archive_landing_zones is True
 
 
+# Built once at import — botocore formats the message in ClientError.__init__.
+_NO_SUCH_KEY_ERR = ClientError(
+    {"Error": {"Code": "NoSuchKey", "Message": "Not found"}}, "GetObject"
+)
+_ACCESS_DENIED_ERR = ClientError(
+    {"Error": {"Code": "AccessDenied", "Message": "Forbidden"}}, "GetObject"
+)
+
+
 class TestReadS3Text:
-    def test_reads_file(self, s3_config: S3Config):
+    def test_reads_file(self, s3_config: S3Config, mock_boto: MagicMock):
         mock_body = MagicMock()
         mock_body.read.return_value = b"SELECT 1"
         mock_client = MagicMock()
         mock_client.get_object.return_value = {"Body": mock_body}
+        mock_boto.return_value = mock_client
 
-        with patch("rat_runner.config.boto3.client", return_value=mock_client):
-            result = read_s3_text(s3_config, "path/to/file.sql")
+        result = read_s3_text(s3_config, "path/to/file.sql")
 
         assert result == "SELECT 1"
         mock_client.get_object.assert_called_once_with(Bucket="test-bucket", Key="path/to/file.sql")
 
-    def test_returns_none_on_no_such_key(self, s3_config: S3Config):
+    def test_returns_none_on_no_such_key(self, s3_config: S3Config, mock_boto: MagicMock):
         mock_client = MagicMock()
-        mock_client.get_object.side_effect = ClientError(
-            {"Error": {"Code": "NoSuchKey", "Message": "Not found"}}, "GetObject"
-        )
+        mock_client.get_object.side_effect = _NO_SUCH_KEY_ERR
+        mock_boto.return_value = mock_client
 
-        with patch("rat_runner.config.boto3.client", return_value=mock_client):
-            result = read_s3_text(s3_config, "missing.sql")
+        result = read_s3_text(s3_config, "missing.sql")
 
         assert result is None
 
-    def test_raises_on_other_errors(self, s3_config: S3Config):
+    def test_raises_on_other_errors(self, s3_config: S3Config, mock_boto: MagicMock):
         mock_client = MagicMock()
-        mock_client.get_object.side_effect = ClientError(
-            {"Error": {"Code": "AccessDenied", "Message": "Forbidden"}}, "GetObject"
-        )
+        mock_client.get_object.side_effect = _ACCESS_DENIED_ERR
+        mock_boto.return_value = mock_client
+
+        with pytest.raises(ClientError) as excinfo:
+            read_s3_text(s3_config, "forbidden.sql")
+        assert excinfo.value.response["Error"]["Code"] == "AccessDenied"
+
 
-        with patch("rat_runner.config.boto3.client", return_value=mock_client):
-            try:
-                read_s3_text(s3_config, "forbidden.sql")
-                assert False, "Should have raised"
-            except ClientError as e:
-                assert e.response["Error"]["Code"] == "AccessDenied"
+def _paginator_client(pages: list[dict[str, object]]) -> MagicMock:
+    """S3 client mock whose list_objects_v2 paginator yields ``pages``."""
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = pages
+    return client
 
 
 class TestListS3Keys:
-    def test_lists_keys_with_prefix(self, s3_config: S3Config):
-        mock_client = MagicMock()
-        mock_paginator = MagicMock()
-        mock_paginator.paginate.return_value = [
-            {
-                "Contents": [
-                    {"Key": "ns/tests/quality/test1.sql"},
-                    {"Key": "ns/tests/quality/test2.sql"},
-                ]
-            }
-        ]
-        mock_client.get_paginator.return_value = mock_paginator
+    def test_lists_keys_with_prefix(self, s3_config: S3Config, mock_boto: MagicMock):
+        mock_boto.return_value = _paginator_client(
+            [
+                {
+                    "Contents": [
+                        {"Key": "ns/tests/quality/test1.sql"},
+                        {"Key": "ns/tests/quality/test2.sql"},
+                    ]
+                }
+            ]
+        )
 
-        with patch("rat_runner.config.boto3.client", return_value=mock_client):
-            keys = list_s3_keys(s3_config, "ns/tests/quality/")
+        keys = list_s3_keys(s3_config, "ns/tests/quality/")
 
         assert keys == ["ns/tests/quality/test1.sql", "ns/tests/quality/test2.sql"]
 
-    def test_filters_by_suffix(self, s3_config: S3Config):
-        mock_client = MagicMock()
-        mock_paginator = MagicMock()
-        mock_paginator.paginate.return_value = [
-            {
-                "Contents": [
-                    {"Key": "ns/tests/quality/test1.sql"},
-                    {"Key": "ns/tests/quality/README.md"},
-                ]
-            }
-        ]
-        mock_client.get_paginator.return_value = mock_paginator
+    def test_filters_by_suffix(self, s3_config: S3Config, mock_boto: MagicMock):
+        mock_boto.return_value = _paginator_client(
+            [
+                {
+                    "Contents": [
+                        {"Key": "ns/tests/quality/test1.sql"},
+                        {"Key": "ns/tests/quality/README.md"},
+                    ]
+                }
+            ]
+        )
 
-        with patch("rat_runner.config.boto3.client", return_value=mock_client):
-            keys = list_s3_keys(s3_config, "ns/tests/quality/", suffix=".sql")
+        keys = list_s3_keys(s3_config, "ns/tests/quality/", suffix=".sql")
 
         assert keys == ["ns/tests/quality/test1.sql"]
 
-    def test_empty_when_no_contents(self, s3_config: S3Config):
-        mock_client = MagicMock()
-        mock_paginator = MagicMock()
-        mock_paginator.paginate.return_value = [{}]  # no Contents key
-        mock_client.get_paginator.return_value = mock_paginator
+    def test_empty_when_no_contents(self, s3_config: S3Config, mock_boto: MagicMock):
+        mock_boto.return_value = _paginator_client([{}])  # no Contents key
 
-        with patch("rat_runner.config.boto3.client", return_value=mock_client):
-            keys = list_s3_keys(s3_config, "ns/empty/")
+        keys = list_s3_keys(s3_config, "ns/empty/")
 
         assert keys == []
 
 
+@pytest.fixture(scope="module")
+def src_keys() -> list[str]:
+    """Landing-zone keys moved by TestMoveS3Keys (move_s3_keys does not mutate them)."""
+    return [
+        "myns/landing/orders/file1.csv",
+        "myns/landing/orders/file2.csv",
+    ]
+
+
 class TestMoveS3Keys:
-    def test_copies_and_deletes(self, s3_config: S3Config):
+    def test_copies_and_deletes(
+        self, s3_config: S3Config, mock_boto: MagicMock, src_keys: list[str]
+    ):
         mock_client = MagicMock()
-        src_keys = [
-            "myns/landing/orders/file1.csv",
-            "myns/landing/orders/file2.csv",
-        ]
+        mock_boto.return_value = mock_client
 
-        with patch("rat_runner.config.boto3.client", return_value=mock_client):
-            move_s3_keys(
-                s3_config,
-                src_keys,
-                "myns/landing/orders/",
-                "myns/landing/orders/_processed/",
-            )
+        move_s3_keys(
+            s3_config,
+            src_keys,
+            "myns/landing/orders/",
+            "myns/landing/orders/_processed/",
+        )
 
         # Verify copy_object called for each key
-        assert mock_client.copy_object.call_count == 2
-        mock_client.copy_object.assert_any_call(
-            Bucket="test-bucket",
-            CopySource={"Bucket": "test-bucket", "Key": "myns/landing/orders/file1.csv"},
-            Key="myns/landing/orders/_processed/file1.csv",
-        )
-        mock_client.copy_object.assert_any_call(
-            Bucket="test-bucket",
-            CopySource={"Bucket": "test-bucket", "Key": "myns/landing/orders/file2.csv"},
-            Key="myns/landing/orders/_processed/file2.csv",
-        )
+        expected = [
+            call(
+                Bucket="test-bucket",
+                CopySource={"Bucket": "test-bucket", "Key": k},
+                Key=f"myns/landing/orders/_processed/{k.rsplit('/', 1)[-1]}",
+            )
+            for k in src_keys
+        ]
+        assert mock_client.copy_object.call_count == len(expected)
+        mock_client.copy_object.assert_has_calls(expected, any_order=True)
 
         # Verify delete_objects called once with all keys
         mock_client.delete_objects.assert_called_once_with(
@@ -784,11 +857,11 @@ class TestMoveS3Keys:
             },
         )
 
-    def test_empty_keys_is_noop(self, s3_config: S3Config):
+    def test_empty_keys_is_noop(self, s3_config: S3Config, mock_boto: MagicMock):
         mock_client = MagicMock()
+        mock_boto.return_value = mock_client
 
-        with patch("rat_runner.config.boto3.client", return_value=mock_client):
-            move_s3_keys(s3_config, [], "src/", "dest/")
+        move_s3_keys(s3_config, [], "src/", "dest/")
 
         mock_client.copy_object.assert_not_called()
         mock_client.delete_objects.assert_not_called()
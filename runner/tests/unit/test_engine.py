@@ -2,46 +2,128 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+import dataclasses
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
 
 import pyarrow as pa
+import pytest
 
 from rat_runner.config import S3Config
 from rat_runner.engine import DuckDBEngine
 
+# Every test patches duckdb.connect, so there is no shared DuckDB state; keep the
+# module on one xdist worker so `import duckdb` is paid once per run.
+pytestmark = pytest.mark.xdist_group("duckdb_engine_unit")
+
+MockConnFactory = Callable[[], Mock]
+
+
+@contextmanager
+def _patched_engine(config: S3Config, mock_conn: object) -> Iterator[DuckDBEngine]:
+    """Yield an engine whose (already opened) DuckDB connection is ``mock_conn``."""
+    with patch("rat_runner.engine.duckdb.connect", return_value=mock_conn):
+        engine = DuckDBEngine(config)
+        _ = engine.conn
+        yield engine
+
+
+class _ArrowConn:
+    """Minimal stand-in for a DuckDB connection whose every execute() yields ``result``.
+
+    Used by the Arrow-path tests, which only care what ``.arrow()`` returns.
+    """
+
+    __slots__ = ("_result",)
+
+    def __init__(self, result: pa.Table | pa.RecordBatchReader) -> None:
+        self._result = result
+
+    def execute(self, *_args: object) -> _ArrowConn:
+        return self
+
+    def arrow(self) -> pa.Table | pa.RecordBatchReader:
+        return self._result
+
+    def close(self) -> None:
+        pass
+
+
+def _executed_sql(mock_conn: Mock) -> list[str]:
+    """SQL text of every conn.execute() call, in order."""
+    return [c.args[0] for c in mock_conn.execute.call_args_list if c.args]
+
+
+def _sql_called(mock_conn: Mock, needle: str) -> bool:
+    return any(needle in sql for sql in _executed_sql(mock_conn))
+
+
+def _bound_params(mock_conn: Mock) -> dict[str, list[object]]:
+    """Map each parameterised statement to the parameters it was executed with."""
+    return {c.args[0]: c.args[1] for c in mock_conn.execute.call_args_list if len(c.args) > 1}
+
 
 class TestDuckDBEngine:
-    def test_creates_connection_lazily(self, s3_config: S3Config):
+    def test_creates_connection_lazily(
+        self, s3_config: S3Config, mock_conn_factory: MockConnFactory
+    ):
         engine = DuckDBEngine(s3_config)
         assert engine._conn is None
 
-        with patch("rat_runner.engine.duckdb.connect") as mock_connect:
-            mock_conn = MagicMock()
-            mock_connect.return_value = mock_conn
+        mock_conn = mock_conn_factory()
+        with patch("rat_runner.engine.duckdb.connect", return_value=mock_conn) as mock_connect:
             _ = engine.conn
 
-        mock_connect.assert_called_once_with(":memory:")
+        mock_connect.assert_called_once_with(
+            ":memory:", config={"memory_limit": "2GB", "threads": 4}
+        )
         assert engine._conn is mock_conn
 
-    def test_configures_s3_extensions(self, s3_config: S3Config):
-        with patch("rat_runner.engine.duckdb.connect") as mock_connect:
-            mock_conn = MagicMock()
-            mock_connect.return_value = mock_conn
-            engine = DuckDBEngine(s3_config)
-            _ = engine.conn
+    def test_configures_s3_extensions(
+        self, s3_config: S3Config, mock_conn_factory: MockConnFactory
+    ):
+        mock_conn = mock_conn_factory()
+        with _patched_engine(s3_config, mock_conn):
+            pass
 
         # Should have called execute for httpfs, iceberg, and S3 config
-        calls = mock_conn.execute.call_args_list
-        assert any("httpfs" in str(c) for c in calls)
-        assert any("iceberg" in str(c) for c in calls)
-        assert any("s3_endpoint" in str(c) for c in calls)
-
-    def test_close_releases_connection(self, s3_config: S3Config):
-        with patch("rat_runner.engine.duckdb.connect") as mock_connect:
-            mock_conn = MagicMock()
-            mock_connect.return_value = mock_conn
-            engine = DuckDBEngine(s3_config)
-            _ = engine.conn
+        assert _sql_called(mock_conn, "httpfs")
+        assert _sql_called(mock_conn, "iceberg")
+        assert _sql_called(mock_conn, "s3_endpoint")
+
+    def test_extension_setup_is_one_statement_batch(
+        self, s3_config: S3Config, mock_conn_factory: MockConnFactory
+    ):
+        mock_conn = mock_conn_factory()
+        with _patched_engine(s3_config, mock_conn):
+            pass
+
+        setup_sql = _executed_sql(mock_conn)[0]
+        assert "LOAD httpfs" in setup_sql
+        assert "LOAD iceberg" in setup_sql
+        assert "s3_url_style" in setup_sql
+
+    def test_connection_setup_execute_count(
+        self, s3_config: S3Config, mock_conn_factory: MockConnFactory
+    ):
+        """One extension-setup script plus one parameterised SET per S3 setting.
+
+        Guards against splitting the extension script back into per-statement
+        executes. The credential SETs cannot be merged further: DuckDB binds
+        parameters only in the last statement of a script.
+        """
+        mock_conn = mock_conn_factory()
+        with _patched_engine(s3_config, mock_conn):
+            pass
+
+        assert mock_conn.execute.call_count == 6
+
+    def test_close_releases_connection(
+        self, s3_config: S3Config, mock_conn_factory: MockConnFactory
+    ):
+        mock_conn = mock_conn_factory()
+        with _patched_engine(s3_config, mock_conn) as engine:
             engine.close()
 
         mock_conn.close.assert_called_once()
@@ -55,72 +137,63 @@ class TestDuckDBEngine:
         table = pa.table({"x": [1, 2, 3]})
         reader = pa.RecordBatchReader.from_batches(table.schema, table.to_batches())
 
-        with patch("rat_runner.engine.duckdb.connect") as mock_connect:
-            mock_conn = MagicMock()
-            mock_connect.return_value = mock_conn
-            mock_result = MagicMock()
-            mock_result.arrow.return_value = reader
-            mock_conn.execute.return_value = mock_result
-
-            engine = DuckDBEngine(s3_config)
+        with _patched_engine(s3_config, _ArrowConn(reader)) as engine:
             result = engine.query_arrow("SELECT 1")
 
         assert isinstance(result, pa.Table)
         assert len(result) == 3
+        assert result.column("x").num_chunks == 1
 
-    def test_sets_session_token_when_present(self):
-        config = S3Config(
-            endpoint="minio:9000",
-            access_key="ak",
-            secret_key="sk",
-            bucket="test",
-            session_token="sts-token-123",
-        )
-        with patch("rat_runner.engine.duckdb.connect") as mock_connect:
-            mock_conn = MagicMock()
-            mock_connect.return_value = mock_conn
-            engine = DuckDBEngine(config)
-            _ = engine.conn
+    def test_query_arrow_returns_table_without_copy(self, s3_config: S3Config):
+        table = pa.table({"x": [1, 2, 3]})
 
-        calls = mock_conn.execute.call_args_list
-        session_calls = [c for c in calls if "s3_session_token" in str(c)]
-        assert len(session_calls) == 1
-        assert "sts-token-123" in str(session_calls[0])
+        with _patched_engine(s3_config, _ArrowConn(table)) as engine:
+            result = engine.query_arrow("SELECT 1")
 
-    def test_explain_analyze_wraps_sql_in_parens(self, s3_config: S3Config):
+        # A Table from DuckDB is passed through as-is — no reader round-trip.
+        assert result is table
+
+    @pytest.mark.parametrize(
+        ("session_token", "expected_params"),
+        [("sts-token-123", [["sts-token-123"]]), ("", [])],
+        ids=["present", "empty"],
+    )
+    def test_session_token_set_only_when_present(
+        self,
+        s3_config: S3Config,
+        mock_conn_factory: MockConnFactory,
+        session_token: str,
+        expected_params: list[list[str]],
+    ):
+        config = dataclasses.replace(s3_config, session_token=session_token)
+        mock_conn = mock_conn_factory()
+        with _patched_engine(config, mock_conn):
+            pass
+
+        params = _bound_params(mock_conn)
+        session_params = [v for sql, v in params.items() if "s3_session_token" in sql]
+        assert session_params == expected_params
+
+    def test_explain_analyze_wraps_sql_in_parens(
+        self, s3_config: S3Config, mock_conn_factory: MockConnFactory
+    ):
         """explain_analyze wraps query in parentheses for safe EXPLAIN ANALYZE."""
-        with patch("rat_runner.engine.duckdb.connect") as mock_connect:
-            mock_conn = MagicMock()
-            mock_connect.return_value = mock_conn
-            mock_result = MagicMock()
-            mock_result.fetchall.return_value = [
+        mock_conn = mock_conn_factory()
+        with _patched_engine(s3_config, mock_conn) as engine:
+            mock_conn.execute.return_value.fetchall.return_value = [
                 (None, "Physical Plan"),
                 (None, "  Scan: table"),
             ]
-            mock_conn.execute.return_value = mock_result
-
-            engine = DuckDBEngine(s3_config)
             result = engine.explain_analyze("SELECT * FROM t")
 
         # Verify the SQL passed to execute is wrapped in parens
-        exec_calls = mock_conn.execute.call_args_list
-        explain_calls = [c for c in exec_calls if "EXPLAIN ANALYZE" in str(c)]
-        assert len(explain_calls) == 1
-        assert "EXPLAIN ANALYZE (SELECT * FROM t)" in str(explain_calls[0])
+        explain_sql = [sql for sql in _executed_sql(mock_conn) if "EXPLAIN ANALYZE" in sql]
+        assert explain_sql == ["EXPLAIN ANALYZE (SELECT * FROM t)"]
         assert result == "Physical Plan\n  Scan: table"
 
-    def test_skips_session_token_when_empty(self, s3_config: S3Config):
-        with patch("rat_runner.engine.duckdb.connect") as mock_connect:
-            mock_conn = MagicMock()
-            mock_connect.return_value = mock_conn
-            engine = DuckDBEngine(s3_config)
-            _ = engine.conn
-
-        calls = mock_conn.execute.call_args_list
-        session_calls = [c for c in calls if "s3_session_token" in str(c)]
-        assert len(session_calls) == 0
-
-    def test_s3_overrides_merged_into_config(self, s3_config: S3Config):
+    def test_s3_overrides_merged_into_config(
+        self, s3_config: S3Config, mock_conn_factory: MockConnFactory
+    ):
         """Per-run overrides win over env-level S3Config (ADR-018 precedence).
 
         ratd vends per-run credentials from the cloud plugin and ships them in
@@ -153,22 +226,20 @@ class TestDuckDBEngine:
         # The base config is untouched (frozen dataclass — defensive check).
         assert s3_config.access_key == "test-access-key"
 
-        with patch("rat_runner.engine.duckdb.connect") as mock_connect:
-            mock_conn = MagicMock()
-            mock_connect.return_value = mock_conn
-            engine = DuckDBEngine(merged)
-            _ = engine.conn
+        mock_conn = mock_conn_factory()
+        with _patched_engine(merged, mock_conn):
+            pass
 
         # The DuckDB connection must be configured with the OVERRIDE values,
         # not the base config — proves the precedence is wired end-to-end.
-        calls_str = "".join(str(c) for c in mock_conn.execute.call_args_list)
-        assert "AKIA-OVR" in calls_str
-        assert "secret-ovr" in calls_str
-        assert "sts-session-xyz" in calls_str
-        assert "eu-west-3" in calls_str
-        assert "s3.eu-west-3.amazonaws.com" in calls_str
+        params = _bound_params(mock_conn)
+        assert params["SET s3_access_key_id = ?"] == ["AKIA-OVR"]
+        assert params["SET s3_secret_access_key = ?"] == ["secret-ovr"]
+        assert params["SET s3_session_token = ?;"] == ["sts-session-xyz"]
+        assert params["SET s3_region = ?"] == ["eu-west-3"]
+        assert params["SET s3_endpoint = ?"] == ["s3.eu-west-3.amazonaws.com"]
         # The env-level access key MUST NOT appear — overrides won.
-        assert "test-access-key" not in calls_str
+        assert ["test-access-key"] not in params.values()
 
     def test_partial_overrides_keep_base_for_unset_fields(self, s3_config: S3Config):
         """Empty/unset override fields fall back to the env-level S3Config.
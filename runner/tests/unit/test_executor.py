@@ -2,26 +2,98 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from collections.abc import Callable, Iterator, Mapping
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
 
 import pyarrow as pa
 import pytest
 
+from rat_runner import executor, nessie
 from rat_runner.config import NessieConfig, S3Config
 from rat_runner.executor import execute_pipeline
 from rat_runner.models import PipelineConfig, QualityTestResult, RunState, RunStatus
 
+# Every executor dependency is mocked, so tests share no filesystem or network
+# state. Under `-n auto --dist loadgroup` the module stays on one worker, so the
+# class-scoped happy_sql_run still executes once per class.
+pytestmark = pytest.mark.xdist_group("executor")
+
+# Canned query results. Tests only pass these through mocks, never mutate them,
+# so one instance per module is enough.
+_TABLE_X1 = pa.table({"x": [1]})
+_TABLE_ID1 = pa.table({"id": [1]})
+_TABLE_VALUE42 = pa.table({"value": [42]})
+_EMPTY_X = pa.table({"x": pa.array([], type=pa.int64())})
+_EMPTY_ID = pa.table({"id": pa.array([], type=pa.int64())})
+
+# Pipeline SQL that reads a landing zone and opts into archiving it.
+_SQL_WITH_ARCHIVE = """-- @archive_landing_zones: true
+SELECT * FROM read_csv_auto('{{ landing_zone('orders') }}/*.csv')"""
+
+# Executor dependencies replaced by the exec_mocks fixture.
+_PATCH_NAMES = (
+    "read_s3_text",
+    "_get_reference",
+    "create_branch",
+    "merge_branch",
+    "delete_branch",
+    "record_failed_merge",
+    "write_iceberg",
+    "merge_iceberg",
+    "append_iceberg",
+    "delete_insert_iceberg",
+    "scd2_iceberg",
+    "snapshot_iceberg",
+    "read_watermark",
+    "DuckDBEngine",
+    "run_quality_tests",
+    "has_error_failures",
+    "execute_python_pipeline",
+    "run_maintenance",
+)
+
+
+def _install(monkeypatch: pytest.MonkeyPatch, **overrides: object) -> None:
+    """Replace ``rat_runner.executor`` attributes; monkeypatch undoes it at teardown.
+
+    Patches the module object directly rather than a dotted-path string, so no
+    per-call import-path resolution.
+    """
+    for name, value in overrides.items():
+        monkeypatch.setattr(executor, name, value)
+
+
+def _suffix_reader(files: Mapping[str, str]) -> Callable[[S3Config, str], str | None]:
+    """A read_s3_text side effect serving ``files`` by key suffix; other keys are absent."""
+    entries = tuple(files.items())
+
+    def _read(cfg: S3Config, key: str) -> str | None:
+        for suffix, content in entries:
+            if key.endswith(suffix):
+                return content
+        return None
+
+    return _read
+
+
+def _registry(**returns: object) -> Mock:
+    """A PluginRegistry instance with no plugins, plus any extra ``method=return``."""
+    registry = Mock()
+    registry.get_strategy.return_value = None
+    registry.get_helpers.return_value = {}
+    registry.dispatch_hooks.return_value = None
+    registry.pipeline_type_names.return_value = []
+    registry.strategy_names.return_value = []
+    for method, value in returns.items():
+        getattr(registry, method).return_value = value
+    return registry
+
 
 @pytest.fixture(autouse=True)
-def _empty_registry():
+def _empty_registry(monkeypatch: pytest.MonkeyPatch) -> None:
     """Prevent plugin discovery — tests exercise the built-in fallback dispatch."""
-    mock_registry = MagicMock()
-    mock_registry.get_strategy.return_value = None
-    mock_registry.get_helpers.return_value = {}
-    mock_registry.dispatch_hooks.return_value = None
-
-    with patch("rat_runner.executor.PluginRegistry", return_value=mock_registry):
-        yield
+    _install(monkeypatch, PluginRegistry=Mock(return_value=_registry()))
 
 
 def _make_run(**kwargs) -> RunState:
@@ -36,186 +108,101 @@ def _make_run(**kwargs) -> RunState:
     return RunState(**defaults)
 
 
-# Common patches for the executor's imports
-_EXEC_PREFIX = "rat_runner.executor"
-
-
-def _patch_all():
-    """Return patches for all executor dependencies."""
-    return {
-        "read_s3_text": patch(f"{_EXEC_PREFIX}.read_s3_text"),
-        "create_branch": patch(f"{_EXEC_PREFIX}.create_branch"),
-        "merge_branch": patch(f"{_EXEC_PREFIX}.merge_branch"),
-        "delete_branch": patch(f"{_EXEC_PREFIX}.delete_branch"),
-        "write_iceberg": patch(f"{_EXEC_PREFIX}.write_iceberg"),
-        "merge_iceberg": patch(f"{_EXEC_PREFIX}.merge_iceberg"),
-        "append_iceberg": patch(f"{_EXEC_PREFIX}.append_iceberg"),
-        "delete_insert_iceberg": patch(f"{_EXEC_PREFIX}.delete_insert_iceberg"),
-        "scd2_iceberg": patch(f"{_EXEC_PREFIX}.scd2_iceberg"),
-        "snapshot_iceberg": patch(f"{_EXEC_PREFIX}.snapshot_iceberg"),
-        "read_watermark": patch(f"{_EXEC_PREFIX}.read_watermark"),
-        "DuckDBEngine": patch(f"{_EXEC_PREFIX}.DuckDBEngine"),
-        "run_quality_tests": patch(f"{_EXEC_PREFIX}.run_quality_tests"),
-        "has_error_failures": patch(f"{_EXEC_PREFIX}.has_error_failures"),
-        "execute_python_pipeline": patch(f"{_EXEC_PREFIX}.execute_python_pipeline"),
-    }
+def _exec_mocks(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    mocks = {name: Mock() for name in _PATCH_NAMES}
+    mocks["create_branch"].return_value = "hash123"
+    mocks["run_quality_tests"].return_value = []
+    mocks["has_error_failures"].return_value = False
+    mocks["read_watermark"].return_value = None
+    _install(monkeypatch, **mocks)
+    return SimpleNamespace(**mocks, engine=mocks["DuckDBEngine"].return_value)
 
 
-class TestExecutePipelineSQLBasic:
-    """Tests for backward-compatible SQL pipeline execution."""
+@pytest.fixture
+def exec_mocks(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Patch every executor dependency in one go and expose the mocks by name.
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_reads_sql_from_s3(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        mock_read.side_effect = lambda cfg, key: "SELECT 1 AS id" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+    Defaults describe the happy path: the branch is created, no quality test
+    fails and there is no stored watermark. ``engine`` is the DuckDBEngine
+    instance the executor will construct. ``_get_reference`` is included so
+    the pre-merge hash capture never reaches the (absent) Nessie server and
+    sits in its retry backoff.
+    """
+    return _exec_mocks(monkeypatch)
 
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
 
-        # Verify S3 key for SQL (first tries .py, then .sql)
-        sql_key = "myns/pipelines/silver/orders/pipeline.sql"
-        mock_read.assert_any_call(s3_config, sql_key)
-
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_compiles_and_executes_sql(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        mock_read.side_effect = lambda cfg, key: (
-            "SELECT 42 AS value" if key.endswith(".sql") else None
-        )
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"value": [42]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+@pytest.fixture
+def nessie_http(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Stub the Nessie client's urlopen and backoff sleep.
 
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
+    For tests that drive the REAL Nessie client code (retry decorator
+    included) against scripted HTTP responses.
+    """
+    urlopen = Mock()
+    sleep = Mock()  # don't actually sleep in tests
+    monkeypatch.setattr(nessie.urllib.request, "urlopen", urlopen)
+    monkeypatch.setattr(nessie.time, "sleep", sleep)
+    return SimpleNamespace(urlopen=urlopen, sleep=sleep)
 
-        mock_engine.query_arrow.assert_called_once()
-        sql_arg = mock_engine.query_arrow.call_args[0][0]
-        assert "42" in sql_arg
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_writes_to_iceberg(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        data = pa.table({"id": [1, 2, 3]})
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = data
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 3
+@pytest.fixture(scope="class")
+def happy_sql_run(
+    s3_config: S3Config, nessie_config: NessieConfig
+) -> Iterator[tuple[RunState, SimpleNamespace]]:
+    """Execute the plain SQL happy path once per class; tests only inspect the outcome.
+
+    Shared by every class that asserts on the default success path (no config,
+    no published versions, branch created and merged).
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        _install(mp, PluginRegistry=Mock(return_value=_registry()))
+        mocks = _exec_mocks(mp)
+        mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 42 AS value"})
+        mocks.engine.query_arrow.return_value = pa.table({"value": [42, 43, 44]})
+        mocks.write_iceberg.return_value = 3
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
+        yield run, mocks
 
-        mock_write.assert_called_once()
-        args = mock_write.call_args
-        assert args[0][0] is data  # data argument
-        assert args[0][1] == "myns.silver.orders"  # table_name
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_sets_success_on_completion(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+class TestExecutePipelineSQLBasic:
+    """Tests for backward-compatible SQL pipeline execution."""
+
+    def test_reads_sql_from_s3(
+        self, happy_sql_run: tuple[RunState, SimpleNamespace], s3_config: S3Config
     ):
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+        _, mocks = happy_sql_run
+        # Verify S3 key for SQL (first tries .py, then .sql)
+        sql_key = "myns/pipelines/silver/orders/pipeline.sql"
+        mocks.read_s3_text.assert_any_call(s3_config, sql_key)
 
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
+    def test_compiles_and_executes_sql(self, happy_sql_run: tuple[RunState, SimpleNamespace]):
+        _, mocks = happy_sql_run
+        mocks.engine.query_arrow.assert_called_once()
+        sql_arg = mocks.engine.query_arrow.call_args[0][0]
+        assert "42" in sql_arg
+
+    def test_writes_to_iceberg(self, happy_sql_run: tuple[RunState, SimpleNamespace]):
+        _, mocks = happy_sql_run
+        mocks.write_iceberg.assert_called_once()
+        args = mocks.write_iceberg.call_args
+        assert args[0][0] is mocks.engine.query_arrow.return_value  # data argument
+        assert args[0][1] == "myns.silver.orders"  # table_name
 
+    def test_sets_success_on_completion(self, happy_sql_run: tuple[RunState, SimpleNamespace]):
+        run, _ = happy_sql_run
         assert run.status == RunStatus.SUCCESS
-        assert run.rows_written == 1
+        assert run.rows_written == 3
+
+    def test_records_duration_ms(self, happy_sql_run: tuple[RunState, SimpleNamespace]):
+        run, _ = happy_sql_run
         assert run.duration_ms >= 0
 
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_sets_failed_on_error(
-        self,
-        mock_read: MagicMock,
-        mock_create: MagicMock,
-        mock_delete: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
-        mock_read.side_effect = Exception("S3 unreachable")
+        exec_mocks.read_s3_text.side_effect = Exception("S3 unreachable")
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
@@ -224,28 +211,10 @@ class TestExecutePipelineSQLBasic:
         assert "S3 unreachable" in run.error
         assert run.duration_ms >= 0
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_respects_cancellation(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1"})
 
         run = _make_run()
         run.cancel_event.set()  # pre-cancel
@@ -255,18 +224,10 @@ class TestExecutePipelineSQLBasic:
         assert run.status == RunStatus.CANCELLED
         assert "cancelled" in run.error.lower()
 
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_handles_missing_sql_file(
-        self,
-        mock_read: MagicMock,
-        mock_create: MagicMock,
-        mock_delete: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
-        mock_read.return_value = None  # no .py or .sql file
+        exec_mocks.read_s3_text.return_value = None  # no .py or .sql file
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
@@ -274,294 +235,131 @@ class TestExecutePipelineSQLBasic:
         assert run.status == RunStatus.FAILED
         assert "not found" in run.error.lower()
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_zero_rows_skips_write(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
-        mock_read.side_effect = lambda cfg, key: (
-            "SELECT 1 WHERE false" if key.endswith(".sql") else None
-        )
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": pa.array([], type=pa.int64())})
-        mock_engine_cls.return_value = mock_engine
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1 WHERE false"})
+        exec_mocks.engine.query_arrow.return_value = _EMPTY_X
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
         assert run.status == RunStatus.SUCCESS
         assert run.rows_written == 0
-        mock_write.assert_not_called()
-
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_records_duration_ms(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
-
-        assert run.duration_ms >= 0
+        exec_mocks.write_iceberg.assert_not_called()
 
 
 class TestExecutePipelinePython:
     """Tests for Python pipeline detection and execution."""
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.execute_python_pipeline")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_detects_python_pipeline(
-        self,
-        mock_read: MagicMock,
-        mock_py_exec: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
-        # .py exists → Python pipeline
-        def read_side(cfg, key):
-            if key.endswith(".py"):
-                return "result = pa.table({'x': [1]})"
-            if key.endswith(".yaml"):
-                return None
-            return None  # .sql not read when .py exists
-
-        mock_read.side_effect = read_side
-        mock_py_exec.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = MagicMock()
-        mock_write.return_value = 1
+        # .py exists → Python pipeline (.sql is not read when .py exists)
+        exec_mocks.read_s3_text.side_effect = _suffix_reader(
+            {".py": "result = pa.table({'x': [1]})"}
+        )
+        exec_mocks.execute_python_pipeline.return_value = _TABLE_X1
+        exec_mocks.write_iceberg.return_value = 1
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
-        mock_py_exec.assert_called_once()
+        exec_mocks.execute_python_pipeline.assert_called_once()
         assert run.status == RunStatus.SUCCESS
 
 
 class TestExecutePipelineIncremental:
     """Tests for incremental merge path."""
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.merge_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.parse_pipeline_config")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_uses_merge_for_incremental(
         self,
-        mock_read: MagicMock,
-        mock_parse_config: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_merge_ice: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+        exec_mocks: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
-        def read_side(cfg, key):
-            if key.endswith(".py"):
-                return None
-            if key.endswith(".sql"):
-                return "SELECT 1 AS id"
-            if key.endswith(".yaml"):
-                return "merge_strategy: incremental"
-            return None
-
-        mock_read.side_effect = read_side
-        mock_parse_config.return_value = PipelineConfig(
-            merge_strategy="incremental",
-            unique_key=("id",),
+        exec_mocks.read_s3_text.side_effect = _suffix_reader(
+            {".sql": "SELECT 1 AS id", ".yaml": "merge_strategy: incremental"}
+        )
+        mock_parse_config = Mock(
+            return_value=PipelineConfig(
+                merge_strategy="incremental",
+                unique_key=("id",),
+            )
         )
+        _install(monkeypatch, parse_pipeline_config=mock_parse_config)
 
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_merge_ice.return_value = 5
+        exec_mocks.engine.query_arrow.return_value = _TABLE_ID1
+        exec_mocks.merge_iceberg.return_value = 5
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
-        mock_merge_ice.assert_called_once()
+        exec_mocks.merge_iceberg.assert_called_once()
         assert run.rows_written == 5
 
 
 class TestExecutePipelineBranches:
     """Tests for ephemeral Nessie branch lifecycle."""
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_success_merges_branch(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
-
+    def test_success_merges_branch(self, happy_sql_run: tuple[RunState, SimpleNamespace]):
+        run, mocks = happy_sql_run
         assert run.status == RunStatus.SUCCESS
-        mock_create.assert_called_once()
-        mock_merge.assert_called_once()
-
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=True)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests")
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_quality_failure_deletes_branch(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-        mock_quality.return_value = [
-            QualityTestResult(
-                test_name="t1",
-                test_file="f1",
-                severity="error",
-                status="fail",
-                row_count=3,
-            )
-        ]
+        mocks.create_branch.assert_called_once()
+        mocks.merge_branch.assert_called_once()
+
+    @pytest.mark.parametrize(
+        ("create_error", "quality_fails", "error_fragments", "downstream_ran"),
+        [
+            (None, True, ("quality",), True),
+            # Behaviour change (was: falls back to main + SUCCESS): Nessie branch
+            # creation failure is now FATAL. Falling back to main caused concurrent
+            # runs to race on main and produced duplicate rows with no rollback
+            # path, so the only safe terminal state for Phase 0 is "branch ready"
+            # or "run failed". See _phase0_create_branch.
+            (Exception("Nessie down"), False, ("branch creation failed", "nessie down"), False),
+        ],
+        ids=["quality-failure", "branch-creation-failure"],
+    )
+    def test_failed_run_never_merges(
+        self,
+        exec_mocks: SimpleNamespace,
+        s3_config: S3Config,
+        nessie_config: NessieConfig,
+        create_error: Exception | None,
+        quality_fails: bool,
+        error_fragments: tuple[str, ...],
+        downstream_ran: bool,
+    ):
+        exec_mocks.create_branch.side_effect = create_error
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1"})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_X1
+        exec_mocks.write_iceberg.return_value = 1
+        exec_mocks.has_error_failures.return_value = quality_fails
+        if quality_fails:
+            exec_mocks.run_quality_tests.return_value = [
+                QualityTestResult(
+                    test_name="t1",
+                    test_file="f1",
+                    severity="error",
+                    status="fail",
+                    row_count=3,
+                )
+            ]
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
         assert run.status == RunStatus.FAILED
-        assert "quality" in run.error.lower()
-        mock_merge.assert_not_called()  # branch NOT merged
-
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", side_effect=Exception("Nessie down"))
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_branch_creation_failure_fails_the_run(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        # Behaviour change (was: falls back to main + SUCCESS): Nessie branch
-        # creation failure is now FATAL. Falling back to main caused concurrent
-        # runs to race on main and produced duplicate rows with no rollback path,
-        # so the only safe terminal state for Phase 0 is "branch ready" or "run
-        # failed". See _phase0_create_branch.
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
-
-        assert run.status == RunStatus.FAILED
-        assert "branch creation failed" in run.error
-        assert "Nessie down" in run.error
-        # Run aborted before any writes — nothing touched main.
-        mock_write.assert_not_called()
-        mock_merge.assert_not_called()
+        for fragment in error_fragments:
+            assert fragment in run.error.lower()
+        # A branch that failed quality is left unmerged; a run that never got a
+        # branch aborts before Phase 1, so nothing downstream touched main.
+        exec_mocks.merge_branch.assert_not_called()
+        assert exec_mocks.write_iceberg.called is downstream_ran
+        assert exec_mocks.run_quality_tests.called is downstream_ran
+        assert exec_mocks.has_error_failures.called is downstream_ran
 
 
 class TestBranchCreationRetry:
@@ -592,18 +390,15 @@ class TestBranchCreationRetry:
 
         return urllib.error.URLError(reason=reason)
 
-    @patch("rat_runner.nessie.time.sleep")  # don't actually sleep in tests
-    @patch("rat_runner.nessie.urllib.request.urlopen")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
+    @pytest.fixture(autouse=True)
+    def _real_create_branch(self, monkeypatch: pytest.MonkeyPatch, exec_mocks: SimpleNamespace):
+        """Phase 0 goes through the real Nessie client; nessie_http stubs its I/O."""
+        _install(monkeypatch, create_branch=nessie.create_branch)
+
     def test_transient_error_three_times_exhausts_retries_and_fails_run(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_urlopen: MagicMock,
-        mock_sleep: MagicMock,
+        exec_mocks: SimpleNamespace,
+        nessie_http: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
@@ -617,9 +412,8 @@ class TestBranchCreationRetry:
         # is higher than 3 (nested retries). The contract we care about
         # is at the outer boundary: the run fails fatally, the message
         # mentions our 4-attempt budget, and no data is written.
-        mock_urlopen.side_effect = self._url_error("Connection refused")
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine_cls.return_value = MagicMock()
+        nessie_http.urlopen.side_effect = self._url_error("Connection refused")
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1"})
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
@@ -629,61 +423,36 @@ class TestBranchCreationRetry:
         # At least one retry-backoff sleep occurred (otherwise nothing was
         # retried). Exact count depends on nested retry stacking; the
         # contract is "we DID retry, then gave up", not the precise N.
-        assert mock_sleep.call_count >= 3
+        assert nessie_http.sleep.call_count >= 3
         # Run aborted before any writes — nothing touched main.
-        mock_write.assert_not_called()
+        exec_mocks.write_iceberg.assert_not_called()
 
-    @patch("rat_runner.nessie.time.sleep")
-    @patch("rat_runner.nessie.urllib.request.urlopen")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_permanent_error_fails_immediately_without_retry(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_urlopen: MagicMock,
-        mock_sleep: MagicMock,
+        exec_mocks: SimpleNamespace,
+        nessie_http: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
         # 400 Bad Request is a permanent 4xx → no retry, fail run on the
         # first attempt.
-        mock_urlopen.side_effect = self._http_error(400, "Bad Request")
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine_cls.return_value = MagicMock()
+        nessie_http.urlopen.side_effect = self._http_error(400, "Bad Request")
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1"})
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
         assert run.status == RunStatus.FAILED
         assert "branch creation failed" in run.error
-        mock_sleep.assert_not_called()  # zero retries
+        nessie_http.sleep.assert_not_called()  # zero retries
         # Only the single failing call was made — no retry.
-        assert mock_urlopen.call_count == 1
-        mock_write.assert_not_called()
-
-    @patch("rat_runner.nessie.time.sleep")
-    @patch("rat_runner.nessie.urllib.request.urlopen")
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
+        assert nessie_http.urlopen.call_count == 1
+        exec_mocks.write_iceberg.assert_not_called()
+
     def test_succeeds_on_retry_attempt_two(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        mock_urlopen: MagicMock,
-        mock_sleep: MagicMock,
+        exec_mocks: SimpleNamespace,
+        nessie_http: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
@@ -711,7 +480,7 @@ class TestBranchCreationRetry:
         # Sequence of urlopen calls during create_branch:
         # attempt 1: _get_reference → 503 (decorator restarts the whole call)
         # attempt 2: _get_reference (ok_ref) → POST (ok_create)
-        mock_urlopen.side_effect = [
+        nessie_http.urlopen.side_effect = [
             urllib.error.HTTPError(
                 url="http://nessie/api/v2/trees/main",
                 code=503,
@@ -723,11 +492,9 @@ class TestBranchCreationRetry:
             ok_create,
         ]
 
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1"})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_X1
+        exec_mocks.write_iceberg.return_value = 1
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
@@ -736,48 +503,31 @@ class TestBranchCreationRetry:
         assert run.status == RunStatus.SUCCESS
         assert run.branch == f"run-{run.run_id}"
         # Exactly one backoff sleep (0.5s) before the retry succeeded.
-        mock_sleep.assert_called_once_with(0.5)
+        nessie_http.sleep.assert_called_once_with(0.5)
 
 
 class TestExecutePipelineArchiveLandingZones:
     """Tests for archive_landing_zones annotation."""
 
-    @patch(f"{_EXEC_PREFIX}.move_s3_keys")
-    @patch(f"{_EXEC_PREFIX}.list_s3_keys")
-    @patch(f"{_EXEC_PREFIX}.validate_landing_zones", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_archives_files_after_successful_merge(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        mock_validate_lz: MagicMock,
-        mock_list_keys: MagicMock,
-        mock_move_keys: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+        exec_mocks: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
-        # SQL with landing_zone + archive annotation
-        sql = """-- @archive_landing_zones: true
-SELECT * FROM read_csv_auto('{{ landing_zone('orders') }}/*.csv')"""
+        mock_list_keys = Mock()
+        mock_move_keys = Mock()
+        _install(
+            monkeypatch,
+            validate_landing_zones=Mock(return_value=[]),
+            list_s3_keys=mock_list_keys,
+            move_s3_keys=mock_move_keys,
+        )
 
-        mock_read.side_effect = lambda cfg, key: sql if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": _SQL_WITH_ARCHIVE})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_ID1
+        exec_mocks.write_iceberg.return_value = 1
 
         landing_keys = [
             "myns/landing/orders/file1.csv",
@@ -800,41 +550,28 @@ SELECT * FROM read_csv_auto('{{ landing_zone('orders') }}/*.csv')"""
             "myns/landing/orders/_processed/r1/",
         )
 
-    @patch(f"{_EXEC_PREFIX}.move_s3_keys")
-    @patch(f"{_EXEC_PREFIX}.list_s3_keys")
-    @patch(f"{_EXEC_PREFIX}.validate_landing_zones", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_skips_archive_when_annotation_absent(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        mock_validate_lz: MagicMock,
-        mock_list_keys: MagicMock,
-        mock_move_keys: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+        exec_mocks: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
+        mock_list_keys = Mock()
+        mock_move_keys = Mock()
+        _install(
+            monkeypatch,
+            validate_landing_zones=Mock(return_value=[]),
+            list_s3_keys=mock_list_keys,
+            move_s3_keys=mock_move_keys,
+        )
+
         # No archive annotation
         sql = "SELECT * FROM read_csv_auto('{{ landing_zone('orders') }}/*.csv')"
 
-        mock_read.side_effect = lambda cfg, key: sql if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": sql})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_ID1
+        exec_mocks.write_iceberg.return_value = 1
 
         run = _make_run(namespace="myns", layer="bronze", pipeline_name="ingest")
         execute_pipeline(run, s3_config, nessie_config)
@@ -842,41 +579,25 @@ SELECT * FROM read_csv_auto('{{ landing_zone('orders') }}/*.csv')"""
         assert run.status == RunStatus.SUCCESS
         mock_move_keys.assert_not_called()
 
-    @patch(f"{_EXEC_PREFIX}.move_s3_keys", side_effect=Exception("S3 move failed"))
-    @patch(f"{_EXEC_PREFIX}.list_s3_keys", return_value=["myns/landing/z/f.csv"])
-    @patch(f"{_EXEC_PREFIX}.validate_landing_zones", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_archive_failure_warns_but_succeeds(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        mock_validate_lz: MagicMock,
-        mock_list_keys: MagicMock,
-        mock_move_keys: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+        exec_mocks: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
-        sql = """-- @archive_landing_zones: true
-SELECT * FROM read_csv_auto('{{ landing_zone('z') }}/*.csv')"""
+        mock_list_keys = Mock(return_value=["myns/landing/orders/f.csv"])
+        mock_move_keys = Mock(side_effect=Exception("S3 move failed"))
+        _install(
+            monkeypatch,
+            validate_landing_zones=Mock(return_value=[]),
+            list_s3_keys=mock_list_keys,
+            move_s3_keys=mock_move_keys,
+        )
 
-        mock_read.side_effect = lambda cfg, key: sql if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": _SQL_WITH_ARCHIVE})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_ID1
+        exec_mocks.write_iceberg.return_value = 1
 
         run = _make_run(namespace="myns", layer="bronze", pipeline_name="ingest")
         execute_pipeline(run, s3_config, nessie_config)
@@ -888,26 +609,10 @@ SELECT * FROM read_csv_auto('{{ landing_zone('z') }}/*.csv')"""
 class TestExecutePipelineVersionedReads:
     """Tests for published_versions support — reading pinned S3 versions."""
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text_version")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_executor_reads_published_version(
         self,
-        mock_read: MagicMock,
-        mock_read_version: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+        exec_mocks: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
@@ -915,14 +620,13 @@ class TestExecutePipelineVersionedReads:
         sql_key = "myns/pipelines/silver/orders/pipeline.sql"
         published_versions = {sql_key: "ver-abc-123"}
 
-        mock_read_version.return_value = "SELECT 42 AS value"
+        mock_read_version = Mock(return_value="SELECT 42 AS value")
+        _install(monkeypatch, read_s3_text_version=mock_read_version)
         # read_s3_text should not be called for keys with published versions
-        mock_read.return_value = None
+        exec_mocks.read_s3_text.return_value = None
 
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"value": [42]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+        exec_mocks.engine.query_arrow.return_value = _TABLE_VALUE42
+        exec_mocks.write_iceberg.return_value = 1
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config, published_versions=published_versions)
@@ -930,40 +634,14 @@ class TestExecutePipelineVersionedReads:
         assert run.status == RunStatus.SUCCESS
         mock_read_version.assert_any_call(s3_config, sql_key, "ver-abc-123")
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_executor_falls_back_to_head(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, happy_sql_run: tuple[RunState, SimpleNamespace], s3_config: S3Config
     ):
         """Without published_versions, read_s3_text (HEAD) is used."""
-        mock_read.side_effect = lambda cfg, key: "SELECT 1 AS id" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)  # no published_versions
-
+        run, mocks = happy_sql_run  # executed with no published_versions
         assert run.status == RunStatus.SUCCESS
         sql_key = "myns/pipelines/silver/orders/pipeline.sql"
-        mock_read.assert_any_call(s3_config, sql_key)
+        mocks.read_s3_text.assert_any_call(s3_config, sql_key)
 
 
 class TestBranchCreationFailureAborts:
@@ -971,82 +649,31 @@ class TestBranchCreationFailureAborts:
 
     This class replaces the old TestNoBranchQualityFailure — the "no branch"
     code path was removed entirely (branch creation is now fatal), so the
-    quality-test and archive logic must never run when Phase 0 fails.
+    quality-test and archive logic must never run when Phase 0 fails. The
+    write/quality half is covered by TestExecutePipelineBranches'
+    branch-outcome table.
     """
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures")
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests")
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", side_effect=Exception("Nessie down"))
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_branch_creation_failure_skips_quality_and_write(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
-
-        assert run.status == RunStatus.FAILED
-        assert "branch creation failed" in run.error
-        # Nothing downstream of Phase 0 should have run.
-        mock_write.assert_not_called()
-        mock_quality.assert_not_called()
-        mock_has_fail.assert_not_called()
-        mock_merge.assert_not_called()
-
-    @patch(f"{_EXEC_PREFIX}.move_s3_keys")
-    @patch(f"{_EXEC_PREFIX}.list_s3_keys")
-    @patch(f"{_EXEC_PREFIX}.validate_landing_zones", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.has_error_failures")
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests")
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", side_effect=Exception("Nessie down"))
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_branch_creation_failure_skips_archive(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        mock_validate_lz: MagicMock,
-        mock_list_keys: MagicMock,
-        mock_move_keys: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+        exec_mocks: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
-        sql = """-- @archive_landing_zones: true
-SELECT * FROM read_csv_auto('{{ landing_zone('orders') }}/*.csv')"""
+        mock_list_keys = Mock()
+        mock_move_keys = Mock()
+        _install(
+            monkeypatch,
+            validate_landing_zones=Mock(return_value=[]),
+            list_s3_keys=mock_list_keys,
+            move_s3_keys=mock_move_keys,
+        )
 
-        mock_read.side_effect = lambda cfg, key: sql if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+        exec_mocks.create_branch.side_effect = Exception("Nessie down")
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": _SQL_WITH_ARCHIVE})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_ID1
+        exec_mocks.write_iceberg.return_value = 1
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
@@ -1058,320 +685,91 @@ SELECT * FROM read_csv_auto('{{ landing_zone('orders') }}/*.csv')"""
 class TestExecutePipelineStrategyDispatch:
     """Tests for new merge strategy dispatch."""
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.append_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_append_only_strategy(
+    @pytest.mark.parametrize(
+        ("headers", "writer", "rows"),
+        [
+            ("-- @merge_strategy: append_only\n", "append_iceberg", 1),
+            ("-- @merge_strategy: delete_insert\n-- @unique_key: id\n", "delete_insert_iceberg", 5),
+            ("-- @merge_strategy: scd2\n-- @unique_key: id\n", "scd2_iceberg", 3),
+            ("-- @merge_strategy: snapshot\n-- @partition_column: date\n", "snapshot_iceberg", 10),
+            # scd2 without unique_key → should fallback
+            ("-- @merge_strategy: scd2\n", "write_iceberg", 1),
+        ],
+        ids=["append_only", "delete_insert", "scd2", "snapshot", "scd2_without_unique_key"],
+    )
+    def test_strategy_dispatches_to_writer(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_append: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
+        exec_mocks: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
+        headers: str,
+        writer: str,
+        rows: int,
     ):
-        sql = "-- @merge_strategy: append_only\nSELECT 1 AS id"
-        mock_read.side_effect = lambda cfg, key: sql if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_append.return_value = 1
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": headers + "SELECT 1 AS id"})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_ID1
+        write_mock: Mock = getattr(exec_mocks, writer)
+        write_mock.return_value = rows
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
-        mock_append.assert_called_once()
-        assert run.status == RunStatus.SUCCESS
-
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.delete_insert_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_delete_insert_strategy(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_di: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        sql = "-- @merge_strategy: delete_insert\n-- @unique_key: id\nSELECT 1 AS id"
-        mock_read.side_effect = lambda cfg, key: sql if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_di.return_value = 5
-
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
-
-        mock_di.assert_called_once()
-        assert run.rows_written == 5
-        assert run.status == RunStatus.SUCCESS
-
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.scd2_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_scd2_strategy(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_scd2: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        sql = "-- @merge_strategy: scd2\n-- @unique_key: id\nSELECT 1 AS id"
-        mock_read.side_effect = lambda cfg, key: sql if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_scd2.return_value = 3
-
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
-
-        mock_scd2.assert_called_once()
-        assert run.rows_written == 3
-
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.snapshot_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_snapshot_strategy(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_snapshot: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        sql = "-- @merge_strategy: snapshot\n-- @partition_column: date\nSELECT 1 AS id"
-        mock_read.side_effect = lambda cfg, key: sql if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_snapshot.return_value = 10
-
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
-
-        mock_snapshot.assert_called_once()
-        assert run.rows_written == 10
-
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
-    def test_missing_unique_key_falls_back_to_full_refresh(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
-    ):
-        # scd2 without unique_key → should fallback
-        sql = "-- @merge_strategy: scd2\nSELECT 1 AS id"
-        mock_read.side_effect = lambda cfg, key: sql if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-
-        run = _make_run()
-        execute_pipeline(run, s3_config, nessie_config)
-
-        mock_write.assert_called_once()
+        write_mock.assert_called_once()
+        assert run.rows_written == rows
         assert run.status == RunStatus.SUCCESS
 
 
 class TestExecutePipelineConfigMerge:
     """Tests for config.yaml + annotation merge logic."""
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.merge_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_annotation_overrides_config_yaml(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_merge_ice: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
         # config.yaml says full_refresh, annotation says incremental
         sql = "-- @merge_strategy: incremental\nSELECT 1 AS id"
         config_yaml = "merge_strategy: full_refresh\nunique_key:\n  - id"
 
-        def read_side(cfg, key):
-            if key.endswith(".py"):
-                return None
-            if key.endswith(".sql"):
-                return sql
-            if key.endswith(".yaml"):
-                return config_yaml
-            return None
-
-        mock_read.side_effect = read_side
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_merge_ice.return_value = 5
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": sql, ".yaml": config_yaml})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_ID1
+        exec_mocks.merge_iceberg.return_value = 5
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
         # Annotation wins: incremental + unique_key from config.yaml
-        mock_merge_ice.assert_called_once()
+        exec_mocks.merge_iceberg.assert_called_once()
         assert run.rows_written == 5
 
-    @patch("rat_runner.executor.run_maintenance")
-    @patch("rat_runner.executor.merge_branch")
-    @patch("rat_runner.executor.delete_branch")
-    @patch("rat_runner.executor.create_branch")
-    @patch("rat_runner.executor.run_quality_tests", return_value=[])
-    @patch("rat_runner.executor.write_iceberg")
-    @patch("rat_runner.executor.DuckDBEngine")
-    @patch("rat_runner.executor.read_s3_text")
     def test_maintenance_runs_after_success(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write_ice: MagicMock,
-        mock_quality: MagicMock,
-        mock_create_branch: MagicMock,
-        mock_delete_branch: MagicMock,
-        mock_merge_branch: MagicMock,
-        mock_maintenance: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ) -> None:
-        mock_read.side_effect = lambda cfg, key: "SELECT 1 AS id" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1 AS id"})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_ID1
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
         assert run.status == RunStatus.SUCCESS
-        mock_maintenance.assert_called_once()
-
-    @patch("rat_runner.executor.run_maintenance")
-    @patch("rat_runner.executor.merge_branch")
-    @patch("rat_runner.executor.delete_branch")
-    @patch("rat_runner.executor.create_branch")
-    @patch("rat_runner.executor.run_quality_tests", return_value=[])
-    @patch("rat_runner.executor.write_iceberg")
-    @patch("rat_runner.executor.DuckDBEngine")
-    @patch("rat_runner.executor.read_s3_text")
+        exec_mocks.run_maintenance.assert_called_once()
+
     def test_maintenance_skipped_zero_rows(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write_ice: MagicMock,
-        mock_quality: MagicMock,
-        mock_create_branch: MagicMock,
-        mock_delete_branch: MagicMock,
-        mock_merge_branch: MagicMock,
-        mock_maintenance: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ) -> None:
-        mock_read.side_effect = lambda cfg, key: (
-            "SELECT 1 AS id WHERE false" if key.endswith(".sql") else None
-        )
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": pa.array([], type=pa.int64())})
-        mock_engine_cls.return_value = mock_engine
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1 AS id WHERE false"})
+        exec_mocks.engine.query_arrow.return_value = _EMPTY_ID
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
         assert run.status == RunStatus.SUCCESS
-        mock_maintenance.assert_not_called()
-
-    @patch("rat_runner.executor.run_maintenance", side_effect=Exception("maintenance failed"))
-    @patch("rat_runner.executor.merge_branch")
-    @patch("rat_runner.executor.delete_branch")
-    @patch("rat_runner.executor.create_branch")
-    @patch("rat_runner.executor.run_quality_tests", return_value=[])
-    @patch("rat_runner.executor.write_iceberg")
-    @patch("rat_runner.executor.DuckDBEngine")
-    @patch("rat_runner.executor.read_s3_text")
+        exec_mocks.run_maintenance.assert_not_called()
+
     def test_maintenance_failure_does_not_fail_run(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write_ice: MagicMock,
-        mock_quality: MagicMock,
-        mock_create_branch: MagicMock,
-        mock_delete_branch: MagicMock,
-        mock_merge_branch: MagicMock,
-        mock_maintenance: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ) -> None:
-        mock_read.side_effect = lambda cfg, key: "SELECT 1 AS id" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"id": [1]})
-        mock_engine_cls.return_value = mock_engine
+        exec_mocks.run_maintenance.side_effect = Exception("maintenance failed")
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1 AS id"})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_ID1
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
@@ -1383,53 +781,34 @@ class TestExecutePipelineConfigMerge:
 class TestExecutePipelinePluginType:
     """Tests for plugin-provided pipeline types (rat.pipeline_types)."""
 
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_plugin_pipeline_type_detected_and_executed(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+        exec_mocks: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ) -> None:
         """A pipeline.<ext> file is detected and dispatched to the plugin type."""
         # Only a pipeline.prql file exists — no pipeline.py / pipeline.sql.
-        mock_read.side_effect = lambda cfg, key: (
-            "from data" if key.endswith("pipeline.prql") else None
-        )
-        mock_write.return_value = 1
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({"pipeline.prql": "from data"})
+        exec_mocks.write_iceberg.return_value = 1
 
         # A fake plugin pipeline type that owns the .prql extension.
-        fake_type = MagicMock()
+        fake_type = Mock()
         fake_type.name = "prql"
         fake_type.file_extension = "prql"
         fake_type.execute.return_value = pa.table({"value": [7]})
 
-        registry = MagicMock()
-        registry.get_strategy.return_value = None
-        registry.get_helpers.return_value = {}
-        registry.dispatch_hooks.return_value = None
-        registry.pipeline_type_names.return_value = ["prql"]
-        registry.get_pipeline_type.return_value = fake_type
+        registry = _registry(pipeline_type_names=["prql"], get_pipeline_type=fake_type)
+        _install(monkeypatch, PluginRegistry=Mock(return_value=registry))
 
         run = _make_run()
-        with patch(f"{_EXEC_PREFIX}.PluginRegistry", return_value=registry):
-            execute_pipeline(run, s3_config, nessie_config)
+        execute_pipeline(run, s3_config, nessie_config)
 
         # The executor looked for the plugin type's file...
-        mock_read.assert_any_call(s3_config, "myns/pipelines/silver/orders/pipeline.prql")
+        exec_mocks.read_s3_text.assert_any_call(
+            s3_config, "myns/pipelines/silver/orders/pipeline.prql"
+        )
         # ...and dispatched execution to the plugin, passing the file's contents.
         fake_type.execute.assert_called_once()
         assert fake_type.execute.call_args[0][0] == "from data"
@@ -1455,39 +834,15 @@ class TestPhase5MergeFailure:
             fp=None,
         )
 
-    @patch(f"{_EXEC_PREFIX}.record_failed_merge")
-    @patch(f"{_EXEC_PREFIX}._get_reference")
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_merge_permanent_4xx_fails_terminally_branch_retained(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        mock_get_ref: MagicMock,
-        mock_audit: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
         """400 on the merge POST → branch NOT deleted; audit row sent."""
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-        mock_get_ref.return_value = {"hash": "deadbeef"}
-        mock_merge.side_effect = self._http_error(400, "Bad Request")
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1"})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_X1
+        exec_mocks.write_iceberg.return_value = 1
+        exec_mocks._get_reference.return_value = {"hash": "deadbeef"}
+        exec_mocks.merge_branch.side_effect = self._http_error(400, "Bad Request")
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
@@ -1496,36 +851,14 @@ class TestPhase5MergeFailure:
         assert "branch merge failed" in run.error
         assert "retained for recovery" in run.error
         # Branch retained — delete_branch was NOT called in the finally.
-        mock_delete.assert_not_called()
+        exec_mocks.delete_branch.assert_not_called()
         # Audit POST sent with classified error_kind.
-        mock_audit.assert_called_once()
-        kwargs = mock_audit.call_args.kwargs
+        exec_mocks.record_failed_merge.assert_called_once()
+        kwargs = exec_mocks.record_failed_merge.call_args.kwargs
         assert kwargs["error_kind"] == "permanent_4xx"
 
-    @patch(f"{_EXEC_PREFIX}.record_failed_merge")
-    @patch(f"{_EXEC_PREFIX}._get_reference")
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_merge_retries_exhausted_branch_retained(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        mock_get_ref: MagicMock,
-        mock_audit: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
         """503 on merge after retries exhausted → branch retained, audit sent.
 
@@ -1535,65 +868,41 @@ class TestPhase5MergeFailure:
         """
         import urllib.error
 
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-        mock_get_ref.return_value = {"hash": "deadbeef"}
-        mock_merge.side_effect = urllib.error.URLError("Connection refused")
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1"})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_X1
+        exec_mocks.write_iceberg.return_value = 1
+        exec_mocks._get_reference.return_value = {"hash": "deadbeef"}
+        exec_mocks.merge_branch.side_effect = urllib.error.URLError("Connection refused")
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
         assert run.status == RunStatus.FAILED
         assert "retained for recovery" in run.error
-        mock_delete.assert_not_called()  # branch NOT swept
-        mock_audit.assert_called_once()
-        assert mock_audit.call_args.kwargs["error_kind"] == "transient_exhausted"
-
-    @patch(f"{_EXEC_PREFIX}.record_failed_merge")
-    @patch(f"{_EXEC_PREFIX}._get_reference")
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.merge_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
+        exec_mocks.delete_branch.assert_not_called()  # branch NOT swept
+        exec_mocks.record_failed_merge.assert_called_once()
+        assert (
+            exec_mocks.record_failed_merge.call_args.kwargs["error_kind"] == "transient_exhausted"
+        )
+
     def test_merge_409_conflict_exhausted_branch_retained(
-        self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_merge: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        mock_get_ref: MagicMock,
-        mock_audit: MagicMock,
-        s3_config: S3Config,
-        nessie_config: NessieConfig,
+        self, exec_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
         """409 bubbling out of merge_branch (after inner refetches gave up)
         → audit row with error_kind='conflict_exhausted'."""
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
-        mock_get_ref.return_value = {"hash": "deadbeef"}
-        mock_merge.side_effect = self._http_error(409, "Conflict")
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1"})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_X1
+        exec_mocks.write_iceberg.return_value = 1
+        exec_mocks._get_reference.return_value = {"hash": "deadbeef"}
+        exec_mocks.merge_branch.side_effect = self._http_error(409, "Conflict")
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
         assert run.status == RunStatus.FAILED
-        mock_delete.assert_not_called()
-        mock_audit.assert_called_once()
-        assert mock_audit.call_args.kwargs["error_kind"] == "conflict_exhausted"
+        exec_mocks.delete_branch.assert_not_called()
+        exec_mocks.record_failed_merge.assert_called_once()
+        assert exec_mocks.record_failed_merge.call_args.kwargs["error_kind"] == "conflict_exhausted"
         assert "retained for recovery" in run.error
 
 
@@ -1602,28 +911,11 @@ class TestPhase5MergeTransientThenSuccess:
     merge_branch is retried by the @retry_on_transient decorator and the
     run reaches SUCCESS without an audit row."""
 
-    @patch(f"{_EXEC_PREFIX}.record_failed_merge")
-    @patch("rat_runner.nessie.time.sleep")
-    @patch("rat_runner.nessie.urllib.request.urlopen")
-    @patch(f"{_EXEC_PREFIX}.has_error_failures", return_value=False)
-    @patch(f"{_EXEC_PREFIX}.run_quality_tests", return_value=[])
-    @patch(f"{_EXEC_PREFIX}.delete_branch")
-    @patch(f"{_EXEC_PREFIX}.create_branch", return_value="hash123")
-    @patch(f"{_EXEC_PREFIX}.write_iceberg")
-    @patch(f"{_EXEC_PREFIX}.DuckDBEngine")
-    @patch(f"{_EXEC_PREFIX}.read_s3_text")
     def test_merge_transient_error_retries_then_succeeds(
         self,
-        mock_read: MagicMock,
-        mock_engine_cls: MagicMock,
-        mock_write: MagicMock,
-        mock_create: MagicMock,
-        mock_delete: MagicMock,
-        mock_quality: MagicMock,
-        mock_has_fail: MagicMock,
-        mock_urlopen: MagicMock,
-        mock_sleep: MagicMock,
-        mock_audit: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+        exec_mocks: SimpleNamespace,
+        nessie_http: SimpleNamespace,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ):
@@ -1664,19 +956,22 @@ class TestPhase5MergeTransientThenSuccess:
             _ok(ref_payload),  # merge_branch: tgt _get_reference
             merge_ok,  # merge POST 200
         ]
-        mock_urlopen.side_effect = responses
+        nessie_http.urlopen.side_effect = responses
+        _install(
+            monkeypatch,
+            _get_reference=nessie._get_reference,
+            merge_branch=nessie.merge_branch,
+        )
 
-        mock_read.side_effect = lambda cfg, key: "SELECT 1" if key.endswith(".sql") else None
-        mock_engine = MagicMock()
-        mock_engine.query_arrow.return_value = pa.table({"x": [1]})
-        mock_engine_cls.return_value = mock_engine
-        mock_write.return_value = 1
+        exec_mocks.read_s3_text.side_effect = _suffix_reader({".sql": "SELECT 1"})
+        exec_mocks.engine.query_arrow.return_value = _TABLE_X1
+        exec_mocks.write_iceberg.return_value = 1
 
         run = _make_run()
         execute_pipeline(run, s3_config, nessie_config)
 
         # SUCCESS — transient handled by the decorator, no audit row.
         assert run.status == RunStatus.SUCCESS, run.error
-        mock_audit.assert_not_called()
+        exec_mocks.record_failed_merge.assert_not_called()
         # Backoff sleep DID fire (we wouldn't have retried without it).
-        assert mock_sleep.call_count >= 1
+        assert nessie_http.sleep.call_count >= 1
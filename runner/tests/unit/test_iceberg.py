@@ -2,11 +2,26 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
 
+import duckdb
 import pyarrow as pa
 import pytest
+from pyiceberg.catalog.rest import RestCatalog
+from pyiceberg.exceptions import NamespaceAlreadyExistsError, NoSuchTableError
+from pyiceberg.expressions import And, In, Or
+from pyiceberg.transforms import (
+    DayTransform,
+    HourTransform,
+    IdentityTransform,
+    MonthTransform,
+    YearTransform,
+)
 
+from rat_runner import iceberg
 from rat_runner.config import NessieConfig, S3Config
 from rat_runner.iceberg import (
     _MAX_COMPOSITE_DELETE_ROWS,
@@ -30,43 +45,181 @@ from rat_runner.iceberg import (
 )
 from rat_runner.models import PartitionByEntry
 
+_ID_VALUE_SCHEMA = pa.schema([("id", pa.int64()), ("value", pa.string())])
+
+
+def _id_value(ids: list[int], values: list[str]) -> pa.Table:
+    """Build an (id int64, value string) table against the declared schema — no type inference."""
+    return pa.Table.from_arrays(
+        [pa.array(ids, type=pa.int64()), pa.array(values, type=pa.string())],
+        schema=_ID_VALUE_SCHEMA,
+    )
+
+
+# Canned Arrow tables. Arrow tables are immutable and the code under test never
+# mutates its inputs, so one instance per module is shared by every test.
+_TABLE_ID1 = pa.table({"id": [1]})
+_TABLE_ID12 = pa.table({"id": [1, 2]})
+_ID_VALUE_1 = _id_value([1], ["a"])
+_ID_VALUE_12 = _id_value([1, 2], ["a", "b"])
+_ID_VALUE_123 = _id_value([1, 2, 3], ["a", "b", "c"])
+_ID_VALUE_2 = _id_value([2], ["b"])
+_ID_VALUE_24_NEW = _id_value([2, 4], ["b_updated", "d"])
+_ID_REGION_VALUE_12 = pa.table({"id": [1, 2], "region": ["us", "eu"], "value": ["a", "b"]})
+_ID_REGION_VALUE_2 = pa.table({"id": [2], "region": ["eu"], "value": ["b"]})
+_ID_REGION_VALUE_1 = pa.table({"id": [1], "region": ["us"], "value": ["a"]})
+_ID_REGION_VALUE_1_NEW = pa.table({"id": [1], "region": ["us"], "value": ["a_new"]})
+_DATE_VALUE_99 = pa.table({"date": ["2024-01"], "value": [99]})
+_EMPTY_ID_VALUE = _id_value([], [])
+_EMPTY_ID_REGION = pa.table(
+    {"id": pa.array([], type=pa.int64()), "region": pa.array([], type=pa.string())}
+)
+_EMPTY_ID_REGION_VALUE = _ID_REGION_VALUE_12.schema.empty_table()
+_EMPTY_DATE_VALUE = pa.schema([("date", pa.string()), ("value", pa.int64())]).empty_table()
+# Built from datetime objects (inferred as timestamp[us]) rather than cast from
+# strings, so no Arrow string-to-timestamp parse runs.
+_SCD2_VALID_FROM = pa.array([datetime(2024, 1, 1), datetime(2024, 1, 1)], type=pa.timestamp("us"))
+
 
-def _make_optimized_mock_table(
-    all_data: pa.Table,
-    filtered_data: pa.Table,
-) -> MagicMock:
-    """Create a mock Iceberg table that supports the optimized delete+append path.
+@pytest.fixture(autouse=True)
+def iceberg_mocks(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Route the writers' get_catalog() to one MagicMock catalog and stub ensure_namespace.
 
-    - current_snapshot().summary["total-records"] returns len(all_data)
-    - scan() with no row_filter returns all_data (full table, fallback path)
-    - scan(row_filter=...) returns filtered_data (rows matching the delete filter)
-    - delete() and append() are plain mocks
+    Tests configure ``iceberg_mocks.catalog`` (load_table, create_table, ...) and
+    assert on ``get_catalog`` / ``ensure_namespace`` directly. The module-level
+    get_catalog and ensure_namespace imported above are the real functions, so
+    TestGetCatalog and TestEnsureNamespace are unaffected.
     """
-    mock_table = MagicMock()
+    catalog = MagicMock()
+    mocks = SimpleNamespace(
+        catalog=catalog,
+        get_catalog=Mock(return_value=catalog),
+        ensure_namespace=Mock(),
+    )
+    monkeypatch.setattr(iceberg, "get_catalog", mocks.get_catalog)
+    monkeypatch.setattr(iceberg, "ensure_namespace", mocks.ensure_namespace)
+    return mocks
+
+
+@pytest.fixture
+def offline_duckdb() -> Iterator[duckdb.DuckDBPyConnection]:
+    """In-memory DuckDB that never fetches extensions, passed to the writers as ``conn=``.
+
+    With a caller-supplied connection the full-rewrite fallbacks skip
+    _configure_s3 (as they do under the executor's engine connection), and with
+    autoinstall/autoload off iceberg_scan fails at once instead of after a
+    network round-trip for the iceberg extension, so the PyIceberg scan
+    fallback runs in milliseconds.
+    """
+    conn = duckdb.connect(
+        ":memory:",
+        config={"autoinstall_known_extensions": False, "autoload_known_extensions": False},
+    )
+    yield conn
+    conn.close()
 
-    def _scan_side_effect(row_filter=None, **kwargs):
-        mock_scan = MagicMock()
-        if row_filter is not None:
-            mock_scan.to_arrow.return_value = filtered_data
-        else:
-            mock_scan.to_arrow.return_value = all_data
-        return mock_scan
 
-    mock_table.scan.side_effect = _scan_side_effect
+def _scan_returning(data: pa.Table) -> MagicMock:
+    """MagicMock table whose scan().to_arrow() returns ``data``.
+
+    For tests that assert on how scan() was called; schema().names() reports
+    data's columns.
+    """
+    table = MagicMock()
+    table.scan.return_value.to_arrow.return_value = data
+    table.schema.return_value.names.return_value = data.schema.names
+    return table
+
+
+class _FakeScan:
+    """What _FakeTable.scan() returns — to_arrow() hands back the stored table."""
+
+    __slots__ = ("_data",)
 
-    # Support _get_row_count via snapshot metadata (O(1) path).
-    mock_snapshot = MagicMock()
-    mock_snapshot.summary = {"total-records": str(len(all_data))}
-    mock_table.current_snapshot.return_value = mock_snapshot
+    def __init__(self, data: pa.Table) -> None:
+        self._data = data
 
-    mock_table.location.return_value = "s3://test-bucket/ns/silver/orders/"
-    return mock_table
+    def to_arrow(self) -> pa.Table:
+        return self._data
+
+
+class _FakeTable:
+    """Hand-written Iceberg table for the delete+append and full-rewrite paths.
+
+    - current_snapshot().summary["total-records"] starts at len(all_data), like
+      a real snapshot summary: delete() removes len(filtered_data) rows (the rows
+      matching the delete filter, or all_data when none is given) and append()
+      adds the appended rows
+    - scan() returns all_data (full table, fallback path)
+    - delete(), append() and overwrite() record their argument in a list
+    - delete() raises ``delete_error`` when one is given
+    - metadata_location points nowhere, so DuckDB's iceberg_scan always fails
+      and the full-rewrite paths read through scan()
+    """
+
+    metadata_location = "/nonexistent/metadata/v1.metadata.json"
+
+    __slots__ = (
+        "_scan_all",
+        "_filtered_rows",
+        "_snapshot",
+        "delete_error",
+        "deleted",
+        "appended",
+        "overwritten",
+    )
+
+    def __init__(
+        self,
+        all_data: pa.Table,
+        filtered_data: pa.Table | None = None,
+        *,
+        delete_error: Exception | None = None,
+    ) -> None:
+        # Scan result and snapshot are built once rather than on every
+        # scan()/current_snapshot() call; delete()/append() update the summary.
+        self._scan_all = _FakeScan(all_data)
+        self._filtered_rows = len(all_data if filtered_data is None else filtered_data)
+        self._snapshot = SimpleNamespace(summary={"total-records": str(len(all_data))})
+        self.delete_error = delete_error
+        self.deleted: list[object] = []
+        self.appended: list[pa.Table] = []
+        self.overwritten: list[pa.Table] = []
+
+    def scan(self, **_kwargs: object) -> _FakeScan:
+        return self._scan_all
+
+    def current_snapshot(self) -> SimpleNamespace:
+        return self._snapshot
+
+    def delete(self, delete_filter: object) -> None:
+        if self.delete_error is not None:
+            raise self.delete_error
+        self.deleted.append(delete_filter)
+        self._add_records(-self._filtered_rows)
+
+    def append(self, data: pa.Table) -> None:
+        self.appended.append(data)
+        self._add_records(len(data))
+
+    def _add_records(self, delta: int) -> None:
+        summary = self._snapshot.summary
+        summary["total-records"] = str(int(summary["total-records"]) + delta)
+
+    def overwrite(self, data: pa.Table) -> None:
+        self.overwritten.append(data)
+
+    def location(self) -> str:
+        return "s3://test-bucket/ns/silver/orders/"
 
 
 class TestGetCatalog:
-    def test_includes_session_token_when_set(self, nessie_config: NessieConfig):
-        from pyiceberg.catalog.rest import RestCatalog
+    # get_catalog() asserts isinstance(catalog, RestCatalog), so load_catalog must
+    # return a spec'd mock. Speccing walks the whole RestCatalog class; the tests
+    # only inspect load_catalog's kwargs, so one pass-through instance is shared.
+    _REST_CATALOG = MagicMock(spec=RestCatalog)
 
+    def test_includes_session_token_when_set(self, nessie_config: NessieConfig):
         sts_config = S3Config(
             endpoint="localhost:9000",
             access_key="ak",
@@ -74,8 +227,7 @@ class TestGetCatalog:
             bucket="test",
             session_token="sts-tok-123",
         )
-        mock_catalog = MagicMock(spec=RestCatalog)
-        with patch("rat_runner.iceberg.load_catalog", return_value=mock_catalog) as mock_load:
+        with patch.object(iceberg, "load_catalog", return_value=self._REST_CATALOG) as mock_load:
             get_catalog(sts_config, nessie_config)
 
         _, kwargs = mock_load.call_args
@@ -84,10 +236,7 @@ class TestGetCatalog:
     def test_excludes_session_token_when_empty(
         self, s3_config: S3Config, nessie_config: NessieConfig
     ):
-        from pyiceberg.catalog.rest import RestCatalog
-
-        mock_catalog = MagicMock(spec=RestCatalog)
-        with patch("rat_runner.iceberg.load_catalog", return_value=mock_catalog) as mock_load:
+        with patch.object(iceberg, "load_catalog", return_value=self._REST_CATALOG) as mock_load:
             get_catalog(s3_config, nessie_config)
 
         _, kwargs = mock_load.call_args
@@ -104,8 +253,6 @@ class TestEnsureNamespace:
         catalog.create_namespace.assert_any_call(("ns", "silver"))
 
     def test_ignores_already_exists(self):
-        from pyiceberg.exceptions import NamespaceAlreadyExistsError
-
         catalog = MagicMock()
         catalog.create_namespace.side_effect = NamespaceAlreadyExistsError("exists")
         ensure_namespace(catalog, "ns.silver")  # should not raise
@@ -117,213 +264,121 @@ class TestEnsureNamespace:
 
 
 class TestWriteIceberg:
-    def test_creates_table_if_not_exists(self, s3_config: S3Config, nessie_config: NessieConfig):
-        from pyiceberg.exceptions import NoSuchTableError
-
+    def test_creates_table_if_not_exists(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
         data = pa.table({"id": [1, 2, 3], "name": ["a", "b", "c"]})
-        mock_catalog = MagicMock()
+        mock_catalog = iceberg_mocks.catalog
         mock_table = MagicMock()
         mock_catalog.load_table.side_effect = NoSuchTableError("nope")
         mock_catalog.create_table.return_value = mock_table
 
-        with patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog):
-            rows = write_iceberg(data, "ns.silver.orders", s3_config, nessie_config, "s3://b/loc/")
+        rows = write_iceberg(data, "ns.silver.orders", s3_config, nessie_config, "s3://b/loc/")
 
         assert rows == 3
         mock_catalog.create_table.assert_called_once()
         mock_table.overwrite.assert_called_once_with(data)
 
-    def test_overwrites_existing_table(self, s3_config: S3Config, nessie_config: NessieConfig):
-        data = pa.table({"id": [1, 2]})
-        mock_catalog = MagicMock()
+    def test_overwrites_existing_table(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        data = _TABLE_ID12
+        mock_catalog = iceberg_mocks.catalog
         mock_table = MagicMock()
         mock_catalog.load_table.return_value = mock_table
 
-        with patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog):
-            rows = write_iceberg(data, "ns.silver.orders", s3_config, nessie_config, "s3://b/loc/")
+        rows = write_iceberg(data, "ns.silver.orders", s3_config, nessie_config, "s3://b/loc/")
 
         assert rows == 2
         mock_table.overwrite.assert_called_once_with(data)
         mock_catalog.create_table.assert_not_called()
 
-    def test_returns_row_count(self, s3_config: S3Config, nessie_config: NessieConfig):
-        data = pa.table({"x": list(range(100))})
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = MagicMock()
+    def test_returns_row_count(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        data = pa.table({"x": pa.nulls(100, pa.int64())})
+        iceberg_mocks.catalog.load_table.return_value = MagicMock()
 
-        with patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog):
-            rows = write_iceberg(data, "ns.gold.agg", s3_config, nessie_config, "s3://b/loc/")
+        rows = write_iceberg(data, "ns.gold.agg", s3_config, nessie_config, "s3://b/loc/")
 
         assert rows == 100
 
-    def test_ensures_namespace(self, s3_config: S3Config, nessie_config: NessieConfig):
-        data = pa.table({"id": [1]})
-        mock_catalog = MagicMock()
+    def test_ensures_namespace(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        data = _TABLE_ID1
+        mock_catalog = iceberg_mocks.catalog
         mock_catalog.load_table.return_value = MagicMock()
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace") as mock_ensure,
-        ):
-            write_iceberg(data, "ns.silver.orders", s3_config, nessie_config, "s3://b/loc/")
+        write_iceberg(data, "ns.silver.orders", s3_config, nessie_config, "s3://b/loc/")
 
-        mock_ensure.assert_called_once_with(mock_catalog, "ns.silver")
+        iceberg_mocks.ensure_namespace.assert_called_once_with(mock_catalog, "ns.silver")
 
-    def test_passes_branch_to_catalog(self, s3_config: S3Config, nessie_config: NessieConfig):
-        data = pa.table({"id": [1]})
+    def test_passes_branch_to_catalog(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        data = _TABLE_ID1
 
-        with (
-            patch("rat_runner.iceberg.get_catalog") as mock_get_catalog,
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            mock_catalog = MagicMock()
-            mock_catalog.load_table.return_value = MagicMock()
-            mock_get_catalog.return_value = mock_catalog
+        iceberg_mocks.catalog.load_table.return_value = MagicMock()
 
-            write_iceberg(
-                data,
-                "ns.silver.orders",
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-                branch="run-r1",
-            )
+        write_iceberg(
+            data,
+            "ns.silver.orders",
+            s3_config,
+            nessie_config,
+            "s3://b/loc/",
+            branch="run-r1",
+        )
 
-        mock_get_catalog.assert_called_once_with(s3_config, nessie_config, branch="run-r1")
+        iceberg_mocks.get_catalog.assert_called_once_with(s3_config, nessie_config, branch="run-r1")
 
 
 class TestMergeIceberg:
-    def _mock_table_with_data(self, data: pa.Table) -> MagicMock:
-        """Create a mock Iceberg table that provides data via scan() fallback.
-
-        Used for the full-rewrite (fallback) path, where scan() is only called
-        without row_filter in the DuckDB fallback code.
-        """
-        mock_table = MagicMock()
-        mock_scan = MagicMock()
-        mock_scan.to_arrow.return_value = data
-        mock_table.scan.return_value = mock_scan
-        mock_table.location.return_value = "s3://test-bucket/ns/silver/orders/"
-        return mock_table
-
-    def test_merge_optimized_single_key(self, s3_config: S3Config, nessie_config: NessieConfig):
-        """Single-column key uses optimized delete+append (no full rewrite)."""
-        existing = pa.table({"id": [1, 2, 3], "value": ["a", "b", "c"]})
-        # Rows matching delete filter: id IN (2, 4) -> only id=2 is in existing
-        filtered = pa.table({"id": [2], "value": ["b"]})
-        new_data = pa.table({"id": [2, 4], "value": ["b_updated", "d"]})
-
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
-
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = merge_iceberg(
-                new_data,
-                "ns.silver.orders",
-                ["id"],
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-            )
-
-        # existing=3, deleted=1 (id=2), appended=2 (id=2,4) -> 3 - 1 + 2 = 4
-        assert rows == 4
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
-        # Overwrite should NOT be called (optimized path)
-        mock_table.overwrite.assert_not_called()
-
     def test_merge_optimized_deduplicates_new_data(
-        self, s3_config: S3Config, nessie_config: NessieConfig
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
         """Single-column key: new_data is deduped before delete+append (last wins)."""
-        existing = pa.table({"id": [1], "value": ["orig"]})
+        existing = _id_value([1], ["orig"])
         # After dedup, new_data has 1 row: id=2, value="second"
         # Filtered: id=2 not in existing, so 0 matches
-        filtered = pa.table(
-            {"id": pa.array([], type=pa.int64()), "value": pa.array([], type=pa.string())}
+        filtered = _EMPTY_ID_VALUE
+        new_data = _id_value([2, 2], ["first", "second"])
+
+        table = _FakeTable(existing, filtered)
+        iceberg_mocks.catalog.load_table.return_value = table
+
+        rows = merge_iceberg(
+            new_data,
+            "ns.silver.orders",
+            ["id"],
+            s3_config,
+            nessie_config,
+            "s3://b/loc/",
         )
-        new_data = pa.table({"id": [2, 2], "value": ["first", "second"]})
-
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
-
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = merge_iceberg(
-                new_data,
-                "ns.silver.orders",
-                ["id"],
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-            )
 
         # existing=1, deleted=0, appended=1 (deduped) -> 1 - 0 + 1 = 2
         assert rows == 2
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
+        assert len(table.deleted) == 1
+        assert len(table.appended) == 1
         # Verify deduped data was appended (last row wins)
-        appended = mock_table.append.call_args[0][0]
+        appended = table.appended[0]
         assert len(appended) == 1
         assert appended.column("value")[0].as_py() == "second"
 
-    def test_merge_composite_key_uses_optimized_path(
-        self, s3_config: S3Config, nessie_config: NessieConfig
-    ):
-        """Composite unique keys with small row count use optimized delete+append."""
-        existing = pa.table({"id": [1, 2], "region": ["us", "eu"], "value": ["a", "b"]})
-        # Rows matching composite filter: (id=2, region=eu) -> 1 existing row
-        filtered = pa.table({"id": [2], "region": ["eu"], "value": ["b"]})
-        new_data = pa.table({"id": [2], "region": ["eu"], "value": ["b_updated"]})
-
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
-
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = merge_iceberg(
-                new_data,
-                "ns.silver.orders",
-                ["id", "region"],
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-            )
-
-        # existing=2, deleted=1 (id=2/eu), appended=1 (updated) -> 2 - 1 + 1 = 2
-        assert rows == 2
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
-        # Overwrite should NOT be called (optimized path)
-        mock_table.overwrite.assert_not_called()
-
+    @pytest.mark.slow
     def test_merge_optimized_failure_falls_back_to_full_rewrite(
-        self, s3_config: S3Config, nessie_config: NessieConfig
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
         """If the optimized path raises, fall back to full rewrite."""
-        existing = pa.table({"id": [1, 2, 3], "value": ["a", "b", "c"]})
-        new_data = pa.table({"id": [2, 4], "value": ["b_updated", "d"]})
+        # Deliberately no conn=: this one case covers the writer opening its own
+        # DuckDB connection and running _configure_s3 (hence the slow mark).
+        existing = _ID_VALUE_123
+        new_data = _ID_VALUE_24_NEW
 
-        mock_table = self._mock_table_with_data(existing)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
+        table = _FakeTable(existing)
+        iceberg_mocks.catalog.load_table.return_value = table
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-            patch("rat_runner.iceberg._try_optimized_delete_append", return_value=None),
-        ):
+        with patch.object(iceberg, "_try_optimized_delete_append", return_value=None):
             rows = merge_iceberg(
                 new_data,
                 "ns.silver.orders",
@@ -335,24 +390,18 @@ class TestMergeIceberg:
 
         # Full rewrite: ANTI JOIN + UNION ALL -> 4 rows
         assert rows == 4
-        mock_table.overwrite.assert_called_once()
-        merged = mock_table.overwrite.call_args[0][0]
-        merged_ids = sorted(merged.column("id").to_pylist())
+        assert len(table.overwritten) == 1
+        merged = table.overwritten[0]
+        merged_ids = merged.column("id").sort().to_pylist()
         assert merged_ids == [1, 2, 3, 4]
 
     def test_merge_falls_back_to_write_on_missing_table(
-        self, s3_config: S3Config, nessie_config: NessieConfig
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
-        from pyiceberg.exceptions import NoSuchTableError
-
-        new_data = pa.table({"id": [1, 2], "value": ["a", "b"]})
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.side_effect = NoSuchTableError("nope")
+        new_data = _ID_VALUE_12
+        iceberg_mocks.catalog.load_table.side_effect = NoSuchTableError("nope")
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.write_iceberg", return_value=2) as mock_write,
-        ):
+        with patch.object(iceberg, "write_iceberg", return_value=2) as mock_write:
             rows = merge_iceberg(
                 new_data,
                 "ns.silver.orders",
@@ -367,196 +416,97 @@ class TestMergeIceberg:
 
 
 class TestReadWatermark:
-    def test_returns_max_value(self, s3_config: S3Config, nessie_config: NessieConfig):
+    def test_returns_max_value(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
         # Only the watermark column is returned (column projection).
         projected = pa.table({"ts": ["2024-01-01", "2024-03-01", "2024-02-01"]})
 
-        mock_catalog = MagicMock()
-        mock_table = MagicMock()
-        mock_scan = MagicMock()
-        mock_scan.to_arrow.return_value = projected
-        mock_table.scan.return_value = mock_scan
-        mock_catalog.load_table.return_value = mock_table
+        mock_table = _scan_returning(projected)
+        iceberg_mocks.catalog.load_table.return_value = mock_table
 
-        with patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog):
-            result = read_watermark("ns.silver.orders", "ts", s3_config, nessie_config)
+        result = read_watermark("ns.silver.orders", "ts", s3_config, nessie_config)
 
         assert result == "2024-03-01"
         # Verify column projection: only the watermark column is requested.
         mock_table.scan.assert_called_once_with(selected_fields=("ts",))
 
-    def test_returns_none_on_missing_table(self, s3_config: S3Config, nessie_config: NessieConfig):
-        from pyiceberg.exceptions import NoSuchTableError
-
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.side_effect = NoSuchTableError("nope")
+    def test_returns_none_on_missing_table(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        iceberg_mocks.catalog.load_table.side_effect = NoSuchTableError("nope")
 
-        with patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog):
-            result = read_watermark("ns.silver.orders", "ts", s3_config, nessie_config)
+        result = read_watermark("ns.silver.orders", "ts", s3_config, nessie_config)
 
         assert result is None
 
-    def test_returns_none_on_empty_table(self, s3_config: S3Config, nessie_config: NessieConfig):
+    def test_returns_none_on_empty_table(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
         # Only the watermark column is returned (column projection).
         projected = pa.table({"ts": pa.array([], type=pa.string())})
 
-        mock_catalog = MagicMock()
-        mock_table = MagicMock()
-        mock_scan = MagicMock()
-        mock_scan.to_arrow.return_value = projected
-        mock_table.scan.return_value = mock_scan
-        mock_catalog.load_table.return_value = mock_table
+        mock_table = _scan_returning(projected)
+        iceberg_mocks.catalog.load_table.return_value = mock_table
 
-        with patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog):
-            result = read_watermark("ns.silver.orders", "ts", s3_config, nessie_config)
+        result = read_watermark("ns.silver.orders", "ts", s3_config, nessie_config)
 
         assert result is None
         mock_table.scan.assert_called_once_with(selected_fields=("ts",))
 
 
 class TestAppendIceberg:
-    def test_appends_to_existing_table(self, s3_config: S3Config, nessie_config: NessieConfig):
-        data = pa.table({"id": [4, 5], "value": ["d", "e"]})
-        mock_catalog = MagicMock()
+    def test_appends_to_existing_table(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        data = _id_value([4, 5], ["d", "e"])
         mock_table = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
+        iceberg_mocks.catalog.load_table.return_value = mock_table
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = append_iceberg(data, "ns.silver.events", s3_config, nessie_config, "s3://b/loc/")
+        rows = append_iceberg(data, "ns.silver.events", s3_config, nessie_config, "s3://b/loc/")
 
         assert rows == 2
         mock_table.append.assert_called_once_with(data)
 
-    def test_creates_table_if_missing(self, s3_config: S3Config, nessie_config: NessieConfig):
-        from pyiceberg.exceptions import NoSuchTableError
-
-        data = pa.table({"id": [1, 2]})
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.side_effect = NoSuchTableError("nope")
+    def test_creates_table_if_missing(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        data = _TABLE_ID12
+        iceberg_mocks.catalog.load_table.side_effect = NoSuchTableError("nope")
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-            patch("rat_runner.iceberg.write_iceberg", return_value=2) as mock_write,
-        ):
+        with patch.object(iceberg, "write_iceberg", return_value=2) as mock_write:
             rows = append_iceberg(data, "ns.silver.events", s3_config, nessie_config, "s3://b/loc/")
 
         assert rows == 2
         mock_write.assert_called_once()
 
-    def test_returns_row_count(self, s3_config: S3Config, nessie_config: NessieConfig):
-        data = pa.table({"x": list(range(50))})
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = MagicMock()
+    def test_returns_row_count(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        data = pa.table({"x": pa.nulls(50, pa.int64())})
+        iceberg_mocks.catalog.load_table.return_value = MagicMock()
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = append_iceberg(data, "ns.silver.logs", s3_config, nessie_config, "s3://b/loc/")
+        rows = append_iceberg(data, "ns.silver.logs", s3_config, nessie_config, "s3://b/loc/")
 
         assert rows == 50
 
 
 class TestDeleteInsertIceberg:
-    def _mock_table_with_data(self, data: pa.Table) -> MagicMock:
-        """Used for the full-rewrite (fallback) path."""
-        mock_table = MagicMock()
-        mock_scan = MagicMock()
-        mock_scan.to_arrow.return_value = data
-        mock_table.scan.return_value = mock_scan
-        return mock_table
-
-    def test_optimized_single_key_no_dedup(self, s3_config: S3Config, nessie_config: NessieConfig):
-        """Single-column key uses optimized delete+append without deduplication."""
-        existing = pa.table({"id": [1, 2, 3], "value": ["a", "b", "c"]})
-        # Rows matching: id IN (2) -> 1 existing row
-        filtered = pa.table({"id": [2], "value": ["b"]})
-        new_data = pa.table({"id": [2, 2], "value": ["b1", "b2"]})
-
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
-
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = delete_insert_iceberg(
-                new_data,
-                "ns.silver.orders",
-                ["id"],
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-            )
-
-        # existing=3, deleted=1 (id=2), appended=2 (id=2,2 NO dedup) -> 3 - 1 + 2 = 4
-        assert rows == 4
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
-        mock_table.overwrite.assert_not_called()
-        # Verify both duplicate rows were appended (no dedup in delete_insert)
-        appended = mock_table.append.call_args[0][0]
-        assert len(appended) == 2
-
-    def test_composite_key_uses_optimized_path(
-        self, s3_config: S3Config, nessie_config: NessieConfig
-    ):
-        """Composite unique keys with small row count use optimized delete+append."""
-        existing = pa.table(
-            {"id": [1, 2, 3], "region": ["us", "eu", "us"], "value": ["a", "b", "c"]}
-        )
-        # Rows matching composite filter: (id=2, region=eu) -> 1 existing row
-        filtered = pa.table({"id": [2], "region": ["eu"], "value": ["b"]})
-        new_data = pa.table({"id": [2, 2], "region": ["eu", "eu"], "value": ["b1", "b2"]})
-
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
-
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = delete_insert_iceberg(
-                new_data,
-                "ns.silver.orders",
-                ["id", "region"],
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-            )
-
-        # existing=3, deleted=1 (id=2/eu), appended=2 (NO dedup) -> 3 - 1 + 2 = 4
-        assert rows == 4
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
-        # Overwrite should NOT be called (optimized path)
-        mock_table.overwrite.assert_not_called()
-        # Verify both duplicate rows were appended (no dedup in delete_insert)
-        appended = mock_table.append.call_args[0][0]
-        assert len(appended) == 2
-
     def test_optimized_failure_falls_back_to_full_rewrite(
-        self, s3_config: S3Config, nessie_config: NessieConfig
+        self,
+        iceberg_mocks: SimpleNamespace,
+        s3_config: S3Config,
+        nessie_config: NessieConfig,
+        offline_duckdb: duckdb.DuckDBPyConnection,
     ):
         """If the optimized path returns None, fall back to full rewrite."""
-        existing = pa.table({"id": [1, 2], "value": ["a", "b"]})
-        new_data = pa.table({"id": [2], "value": ["b_updated"]})
+        existing = _ID_VALUE_12
+        new_data = _id_value([2], ["b_updated"])
 
-        mock_table = self._mock_table_with_data(existing)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
+        table = _FakeTable(existing)
+        iceberg_mocks.catalog.load_table.return_value = table
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-            patch("rat_runner.iceberg._try_optimized_delete_append", return_value=None),
-        ):
+        with patch.object(iceberg, "_try_optimized_delete_append", return_value=None):
             rows = delete_insert_iceberg(
                 new_data,
                 "ns.silver.orders",
@@ -564,22 +514,19 @@ class TestDeleteInsertIceberg:
                 s3_config,
                 nessie_config,
                 "s3://b/loc/",
+                conn=offline_duckdb,
             )
 
         assert rows == 2
-        mock_table.overwrite.assert_called_once()
-
-    def test_falls_back_on_missing_table(self, s3_config: S3Config, nessie_config: NessieConfig):
-        from pyiceberg.exceptions import NoSuchTableError
+        assert len(table.overwritten) == 1
 
-        new_data = pa.table({"id": [1], "value": ["a"]})
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.side_effect = NoSuchTableError("nope")
+    def test_falls_back_on_missing_table(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        new_data = _ID_VALUE_1
+        iceberg_mocks.catalog.load_table.side_effect = NoSuchTableError("nope")
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.write_iceberg", return_value=1) as mock_write,
-        ):
+        with patch.object(iceberg, "write_iceberg", return_value=1) as mock_write:
             rows = delete_insert_iceberg(
                 new_data,
                 "ns.silver.orders",
@@ -594,30 +541,13 @@ class TestDeleteInsertIceberg:
 
 
 class TestScd2Iceberg:
-    def _mock_table_with_data(self, data: pa.Table) -> MagicMock:
-        mock_table = MagicMock()
-        mock_scan = MagicMock()
-        mock_scan.to_arrow.return_value = data
-        mock_table.scan.return_value = mock_scan
-        mock_table.schema.return_value = MagicMock(names=lambda: list(data.schema.names))
-        # Override schema() to return something with .names()
-        mock_schema = MagicMock()
-        mock_schema.names.return_value = list(data.schema.names)
-        mock_table.schema.return_value = mock_schema
-        return mock_table
-
-    def test_first_run_adds_scd_columns(self, s3_config: S3Config, nessie_config: NessieConfig):
-        from pyiceberg.exceptions import NoSuchTableError
-
+    def test_first_run_adds_scd_columns(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
         new_data = pa.table({"id": [1, 2], "name": ["alice", "bob"]})
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.side_effect = NoSuchTableError("nope")
+        iceberg_mocks.catalog.load_table.side_effect = NoSuchTableError("nope")
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-            patch("rat_runner.iceberg.write_iceberg", return_value=2) as mock_write,
-        ):
+        with patch.object(iceberg, "write_iceberg", return_value=2) as mock_write:
             rows = scd2_iceberg(
                 new_data,
                 "ns.silver.customers",
@@ -633,53 +563,46 @@ class TestScd2Iceberg:
         assert "valid_from" in written_data.column_names
         assert "valid_to" in written_data.column_names
 
-    def test_closes_existing_opens_new(self, s3_config: S3Config, nessie_config: NessieConfig):
-        import pyarrow as pa
-
+    def test_closes_existing_opens_new(
+        self,
+        iceberg_mocks: SimpleNamespace,
+        s3_config: S3Config,
+        nessie_config: NessieConfig,
+        offline_duckdb: duckdb.DuckDBPyConnection,
+    ):
         existing = pa.table(
             {
                 "id": [1, 2],
                 "name": ["alice", "bob"],
-                "valid_from": pa.array(
-                    ["2024-01-01 00:00:00", "2024-01-01 00:00:00"], type=pa.string()
-                ).cast(pa.timestamp("us")),
+                "valid_from": _SCD2_VALID_FROM,
                 "valid_to": pa.array([None, None], type=pa.timestamp("us")),
             }
         )
         new_data = pa.table({"id": [1], "name": ["alice_updated"]})
 
-        mock_catalog = MagicMock()
-        mock_table = self._mock_table_with_data(existing)
-        mock_catalog.load_table.return_value = mock_table
-
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = scd2_iceberg(
-                new_data,
-                "ns.silver.customers",
-                ["id"],
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-            )
+        mock_table = _scan_returning(existing)
+        iceberg_mocks.catalog.load_table.return_value = mock_table
+
+        rows = scd2_iceberg(
+            new_data,
+            "ns.silver.customers",
+            ["id"],
+            s3_config,
+            nessie_config,
+            "s3://b/loc/",
+            conn=offline_duckdb,
+        )
 
         # id=1 (closed) + id=2 (kept open) + id=1 new (opened) = 3 rows
         assert rows == 3
 
-    def test_custom_column_names(self, s3_config: S3Config, nessie_config: NessieConfig):
-        from pyiceberg.exceptions import NoSuchTableError
-
-        new_data = pa.table({"id": [1]})
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.side_effect = NoSuchTableError("nope")
+    def test_custom_column_names(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
+        new_data = _TABLE_ID1
+        iceberg_mocks.catalog.load_table.side_effect = NoSuchTableError("nope")
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-            patch("rat_runner.iceberg.write_iceberg", return_value=1) as mock_write,
-        ):
+        with patch.object(iceberg, "write_iceberg", return_value=1) as mock_write:
             scd2_iceberg(
                 new_data,
                 "ns.silver.t",
@@ -697,94 +620,12 @@ class TestScd2Iceberg:
 
 
 class TestSnapshotIceberg:
-    def _mock_table_with_data(self, data: pa.Table) -> MagicMock:
-        """Used for the full-rewrite (fallback) path."""
-        mock_table = MagicMock()
-        mock_scan = MagicMock()
-        mock_scan.to_arrow.return_value = data
-        mock_table.scan.return_value = mock_scan
-        return mock_table
-
-    def test_optimized_replaces_touched_partitions(
-        self, s3_config: S3Config, nessie_config: NessieConfig
-    ):
-        """Optimized path: delete rows matching partition values + append new data."""
-        existing = pa.table(
-            {
-                "date": ["2024-01", "2024-01", "2024-02", "2024-03"],
-                "value": [1, 2, 3, 4],
-            }
-        )
-        # Rows matching: date IN ("2024-01") -> 2 existing rows
-        filtered = pa.table({"date": ["2024-01", "2024-01"], "value": [1, 2]})
-        new_data = pa.table({"date": ["2024-01"], "value": [99]})
-
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
-
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = snapshot_iceberg(
-                new_data,
-                "ns.silver.metrics",
-                "date",
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-            )
-
-        # existing=4, deleted=2 (2024-01), appended=1 (2024-01 new) -> 4 - 2 + 1 = 3
-        assert rows == 3
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
-        mock_table.overwrite.assert_not_called()
-
-    def test_optimized_keeps_untouched_partitions(
-        self, s3_config: S3Config, nessie_config: NessieConfig
-    ):
-        """Optimized path with new partition value: no existing rows deleted."""
-        existing = pa.table(
-            {
-                "date": ["2024-01", "2024-02"],
-                "value": [1, 2],
-            }
-        )
-        # Rows matching: date IN ("2024-03") -> 0 rows (new partition)
-        filtered = pa.table(
-            {
-                "date": pa.array([], type=pa.string()),
-                "value": pa.array([], type=pa.int64()),
-            }
-        )
-        new_data = pa.table({"date": ["2024-03"], "value": [3]})
-
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
-
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-        ):
-            rows = snapshot_iceberg(
-                new_data,
-                "ns.silver.metrics",
-                "date",
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-            )
-
-        # existing=2, deleted=0, appended=1 -> 2 - 0 + 1 = 3
-        assert rows == 3
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
-
     def test_optimized_failure_falls_back_to_full_rewrite(
-        self, s3_config: S3Config, nessie_config: NessieConfig
+        self,
+        iceberg_mocks: SimpleNamespace,
+        s3_config: S3Config,
+        nessie_config: NessieConfig,
+        offline_duckdb: duckdb.DuckDBPyConnection,
     ):
         """If optimized path fails, fall back to DuckDB partition filter + overwrite."""
         existing = pa.table(
@@ -793,17 +634,12 @@ class TestSnapshotIceberg:
                 "value": [1, 2, 3, 4],
             }
         )
-        new_data = pa.table({"date": ["2024-01"], "value": [99]})
+        new_data = _DATE_VALUE_99
 
-        mock_table = self._mock_table_with_data(existing)
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
+        table = _FakeTable(existing)
+        iceberg_mocks.catalog.load_table.return_value = table
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.ensure_namespace"),
-            patch("rat_runner.iceberg._try_optimized_delete_append", return_value=None),
-        ):
+        with patch.object(iceberg, "_try_optimized_delete_append", return_value=None):
             rows = snapshot_iceberg(
                 new_data,
                 "ns.silver.metrics",
@@ -811,26 +647,23 @@ class TestSnapshotIceberg:
                 s3_config,
                 nessie_config,
                 "s3://b/loc/",
+                conn=offline_duckdb,
             )
 
         # Full rewrite: 2024-02 (1) + 2024-03 (1) + 2024-01 (1 new) = 3
         assert rows == 3
-        mock_table.overwrite.assert_called_once()
-        merged = mock_table.overwrite.call_args[0][0]
-        dates = sorted(merged.column("date").to_pylist())
+        assert len(table.overwritten) == 1
+        merged = table.overwritten[0]
+        dates = merged.column("date").sort().to_pylist()
         assert dates == ["2024-01", "2024-02", "2024-03"]
 
-    def test_falls_back_on_missing_table(self, s3_config: S3Config, nessie_config: NessieConfig):
-        from pyiceberg.exceptions import NoSuchTableError
-
+    def test_falls_back_on_missing_table(
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
+    ):
         new_data = pa.table({"date": ["2024-01"], "value": [1]})
-        mock_catalog = MagicMock()
-        mock_catalog.load_table.side_effect = NoSuchTableError("nope")
+        iceberg_mocks.catalog.load_table.side_effect = NoSuchTableError("nope")
 
-        with (
-            patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog),
-            patch("rat_runner.iceberg.write_iceberg", return_value=1) as mock_write,
-        ):
+        with patch.object(iceberg, "write_iceberg", return_value=1) as mock_write:
             rows = snapshot_iceberg(
                 new_data,
                 "ns.silver.metrics",
@@ -844,11 +677,108 @@ class TestSnapshotIceberg:
         mock_write.assert_called_once()
 
 
+class TestOptimizedDeleteAppendWriters:
+    """merge / delete_insert / snapshot all take the delete+append path when they can.
+
+    Each case: total = existing - deleted (rows matching the delete filter) +
+    appended. merge dedups new_data on the key first; delete_insert does not.
+    """
+
+    @pytest.mark.parametrize(
+        ("writer", "key", "existing", "filtered", "new_data", "expected_rows", "appended_rows"),
+        [
+            # id IN (2, 4) matches only id=2: 3 - 1 + 2 = 4
+            (merge_iceberg, ["id"], _ID_VALUE_123, _ID_VALUE_2, _ID_VALUE_24_NEW, 4, 2),
+            # (id=2, region=eu) matches 1 row: 2 - 1 + 1 = 2
+            (
+                merge_iceberg,
+                ["id", "region"],
+                _ID_REGION_VALUE_12,
+                _ID_REGION_VALUE_2,
+                pa.table({"id": [2], "region": ["eu"], "value": ["b_updated"]}),
+                2,
+                1,
+            ),
+            # id IN (2) matches 1 row, both duplicates appended: 3 - 1 + 2 = 4
+            (
+                delete_insert_iceberg,
+                ["id"],
+                _ID_VALUE_123,
+                _ID_VALUE_2,
+                _id_value([2, 2], ["b1", "b2"]),
+                4,
+                2,
+            ),
+            # (id=2, region=eu) matches 1 row, both duplicates appended: 3 - 1 + 2 = 4
+            (
+                delete_insert_iceberg,
+                ["id", "region"],
+                pa.table({"id": [1, 2, 3], "region": ["us", "eu", "us"], "value": ["a", "b", "c"]}),
+                _ID_REGION_VALUE_2,
+                pa.table({"id": [2, 2], "region": ["eu", "eu"], "value": ["b1", "b2"]}),
+                4,
+                2,
+            ),
+            # date IN ("2024-01") matches 2 rows: 4 - 2 + 1 = 3
+            (
+                snapshot_iceberg,
+                "date",
+                pa.table(
+                    {"date": ["2024-01", "2024-01", "2024-02", "2024-03"], "value": [1, 2, 3, 4]}
+                ),
+                pa.table({"date": ["2024-01", "2024-01"], "value": [1, 2]}),
+                _DATE_VALUE_99,
+                3,
+                1,
+            ),
+            # date IN ("2024-03") is a new partition, nothing matches: 2 - 0 + 1 = 3
+            (
+                snapshot_iceberg,
+                "date",
+                pa.table({"date": ["2024-01", "2024-02"], "value": [1, 2]}),
+                _EMPTY_DATE_VALUE,
+                pa.table({"date": ["2024-03"], "value": [3]}),
+                3,
+                1,
+            ),
+        ],
+        ids=[
+            "merge_single_key",
+            "merge_composite_key",
+            "delete_insert_single_key_no_dedup",
+            "delete_insert_composite_key_no_dedup",
+            "snapshot_replaces_touched_partition",
+            "snapshot_keeps_untouched_partitions",
+        ],
+    )
+    def test_deletes_matching_rows_then_appends(
+        self,
+        iceberg_mocks: SimpleNamespace,
+        s3_config: S3Config,
+        nessie_config: NessieConfig,
+        writer: Callable[..., int],
+        key: list[str] | str,
+        existing: pa.Table,
+        filtered: pa.Table,
+        new_data: pa.Table,
+        expected_rows: int,
+        appended_rows: int,
+    ):
+        table = _FakeTable(existing, filtered)
+        iceberg_mocks.catalog.load_table.return_value = table
+
+        rows = writer(new_data, "ns.silver.orders", key, s3_config, nessie_config, "s3://b/loc/")
+
+        assert rows == expected_rows
+        assert len(table.deleted) == 1
+        assert [len(t) for t in table.appended] == [appended_rows]
+        # Overwrite should NOT be called (optimized path)
+        assert table.overwritten == []
+
+
 class TestBuildPartitionSpec:
     def test_single_identity_partition(self):
         """Identity transform should use the source field's ID."""
-        from pyiceberg.transforms import IdentityTransform
-
         schema = pa.schema([("region", pa.string()), ("value", pa.int64())])
         entries = (PartitionByEntry(column="region", transform="identity"),)
 
@@ -863,8 +793,6 @@ class TestBuildPartitionSpec:
 
     def test_day_transform(self):
         """Day transform on a date column."""
-        from pyiceberg.transforms import DayTransform
-
         schema = pa.schema([("created_date", pa.date32()), ("id", pa.int64())])
         entries = (PartitionByEntry(column="created_date", transform="day"),)
 
@@ -898,29 +826,23 @@ class TestBuildPartitionSpec:
         assert spec.fields[1].name == "region"
         assert spec.fields[1].source_id == 2  # region is column 1 -> ID 2
 
-    def test_all_supported_transforms(self):
+    @pytest.mark.parametrize(
+        ("transform_name", "transform_cls"),
+        [
+            ("identity", IdentityTransform),
+            ("day", DayTransform),
+            ("month", MonthTransform),
+            ("year", YearTransform),
+            ("hour", HourTransform),
+        ],
+        ids=["identity", "day", "month", "year", "hour"],
+    )
+    def test_all_supported_transforms(self, transform_name: str, transform_cls: type):
         """All supported transforms (identity, day, month, year, hour) should work."""
-        from pyiceberg.transforms import (
-            DayTransform,
-            HourTransform,
-            IdentityTransform,
-            MonthTransform,
-            YearTransform,
-        )
-
         schema = pa.schema([("ts", pa.timestamp("us"))])
-        transforms = {
-            "identity": IdentityTransform,
-            "day": DayTransform,
-            "month": MonthTransform,
-            "year": YearTransform,
-            "hour": HourTransform,
-        }
-
-        for transform_name, transform_cls in transforms.items():
-            entries = (PartitionByEntry(column="ts", transform=transform_name),)
-            spec = build_partition_spec(schema, entries)
-            assert isinstance(spec.fields[0].transform, transform_cls)
+        entries = (PartitionByEntry(column="ts", transform=transform_name),)
+        spec = build_partition_spec(schema, entries)
+        assert isinstance(spec.fields[0].transform, transform_cls)
 
     def test_empty_partition_by_returns_empty_spec(self):
         """Empty partition_by list returns an unpartitioned spec."""
@@ -948,27 +870,24 @@ class TestBuildPartitionSpec:
 
 class TestWriteIcebergWithPartitions:
     def test_creates_table_with_partition_spec(
-        self, s3_config: S3Config, nessie_config: NessieConfig
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
         """When partition_by is provided and table doesn't exist, create_table should receive a partition_spec."""
-        from pyiceberg.exceptions import NoSuchTableError
 
         data = pa.table({"id": [1, 2], "region": ["us", "eu"]})
-        mock_catalog = MagicMock()
-        mock_table = MagicMock()
+        mock_catalog = iceberg_mocks.catalog
         mock_catalog.load_table.side_effect = NoSuchTableError("nope")
-        mock_catalog.create_table.return_value = mock_table
+        mock_catalog.create_table.return_value = _FakeTable(_EMPTY_ID_VALUE)
         partition_by = (PartitionByEntry(column="region", transform="identity"),)
 
-        with patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog):
-            rows = write_iceberg(
-                data,
-                "ns.silver.orders",
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-                partition_by=partition_by,
-            )
+        rows = write_iceberg(
+            data,
+            "ns.silver.orders",
+            s3_config,
+            nessie_config,
+            "s3://b/loc/",
+            partition_by=partition_by,
+        )
 
         assert rows == 2
         call_kwargs = mock_catalog.create_table.call_args[1]
@@ -978,46 +897,42 @@ class TestWriteIcebergWithPartitions:
         assert spec.fields[0].name == "region"
 
     def test_creates_table_without_partition_spec_when_none(
-        self, s3_config: S3Config, nessie_config: NessieConfig
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
         """When partition_by is None, create_table should NOT receive partition_spec."""
-        from pyiceberg.exceptions import NoSuchTableError
 
-        data = pa.table({"id": [1]})
-        mock_catalog = MagicMock()
-        mock_table = MagicMock()
+        data = _TABLE_ID1
+        mock_catalog = iceberg_mocks.catalog
         mock_catalog.load_table.side_effect = NoSuchTableError("nope")
-        mock_catalog.create_table.return_value = mock_table
+        mock_catalog.create_table.return_value = _FakeTable(_EMPTY_ID_VALUE)
 
-        with patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog):
-            write_iceberg(data, "ns.silver.t", s3_config, nessie_config, "s3://b/loc/")
+        write_iceberg(data, "ns.silver.t", s3_config, nessie_config, "s3://b/loc/")
 
         call_kwargs = mock_catalog.create_table.call_args[1]
         assert "partition_spec" not in call_kwargs
 
     def test_partition_spec_ignored_for_existing_table(
-        self, s3_config: S3Config, nessie_config: NessieConfig
+        self, iceberg_mocks: SimpleNamespace, s3_config: S3Config, nessie_config: NessieConfig
     ):
         """When table already exists, partition_by is ignored (no table creation)."""
         data = pa.table({"id": [1], "region": ["us"]})
-        mock_catalog = MagicMock()
-        mock_table = MagicMock()
-        mock_catalog.load_table.return_value = mock_table
+        mock_catalog = iceberg_mocks.catalog
+        table = _FakeTable(data)
+        mock_catalog.load_table.return_value = table
         partition_by = (PartitionByEntry(column="region", transform="identity"),)
 
-        with patch("rat_runner.iceberg.get_catalog", return_value=mock_catalog):
-            rows = write_iceberg(
-                data,
-                "ns.silver.orders",
-                s3_config,
-                nessie_config,
-                "s3://b/loc/",
-                partition_by=partition_by,
-            )
+        rows = write_iceberg(
+            data,
+            "ns.silver.orders",
+            s3_config,
+            nessie_config,
+            "s3://b/loc/",
+            partition_by=partition_by,
+        )
 
         assert rows == 1
         mock_catalog.create_table.assert_not_called()
-        mock_table.overwrite.assert_called_once_with(data)
+        assert table.overwritten == [data]
 
 
 class TestEscapeSqlString:
@@ -1048,8 +963,6 @@ class TestBuildDeleteFilterSingleKey:
         values = pa.array([1, 2, 3])
         result = _build_delete_filter_single_key("id", values)
 
-        from pyiceberg.expressions import In
-
         assert isinstance(result, In)
 
     def test_builds_in_filter_from_chunked_array(self):
@@ -1058,16 +971,12 @@ class TestBuildDeleteFilterSingleKey:
         chunked = table.column("id")
         result = _build_delete_filter_single_key("id", chunked)
 
-        from pyiceberg.expressions import In
-
         assert isinstance(result, In)
 
     def test_builds_in_filter_from_python_list(self):
         """Plain Python list values are also supported."""
         result = _build_delete_filter_single_key("name", ["alice", "bob"])
 
-        from pyiceberg.expressions import In
-
         assert isinstance(result, In)
 
     def test_deduplicates_values(self):
@@ -1075,9 +984,8 @@ class TestBuildDeleteFilterSingleKey:
         values = pa.array([1, 1, 2, 2, 3])
         result = _build_delete_filter_single_key("id", values)
 
-        from pyiceberg.expressions import In
-
         assert isinstance(result, In)
+        assert sorted(lit.value for lit in result.literals) == [1, 2, 3]
 
 
 class TestExtractCompositeKeyRows:
@@ -1104,12 +1012,7 @@ class TestExtractCompositeKeyRows:
 
     def test_empty_table_returns_empty_list(self):
         """Empty table returns empty list."""
-        data = pa.table(
-            {
-                "id": pa.array([], type=pa.int64()),
-                "region": pa.array([], type=pa.string()),
-            }
-        )
+        data = _EMPTY_ID_REGION
         result = _extract_composite_key_rows(data, ["id", "region"])
 
         assert result == []
@@ -1127,8 +1030,6 @@ class TestBuildDeleteFilterCompositeKey:
 
     def test_multi_row_builds_or_of_ands(self):
         """Multiple rows produce Or(And(...), And(...))."""
-        from pyiceberg.expressions import Or
-
         result = _build_delete_filter_composite_key(
             ["id", "region"],
             [(1, "us"), (2, "eu")],
@@ -1137,8 +1038,6 @@ class TestBuildDeleteFilterCompositeKey:
 
     def test_single_row_builds_and_without_or(self):
         """Single row produces And(...) directly (no Or wrapper)."""
-        from pyiceberg.expressions import And
-
         result = _build_delete_filter_composite_key(
             ["id", "region"],
             [(1, "us")],
@@ -1147,8 +1046,6 @@ class TestBuildDeleteFilterCompositeKey:
 
     def test_null_values_use_is_null(self):
         """NULL values in key columns produce IsNull() predicates."""
-        from pyiceberg.expressions import And
-
         result = _build_delete_filter_composite_key(
             ["id", "region"],
             [(1, None)],
@@ -1165,8 +1062,6 @@ class TestBuildDeleteFilterCompositeKey:
 
     def test_three_rows_builds_correct_or(self):
         """Three rows produce Or(And(...), And(...), And(...))."""
-        from pyiceberg.expressions import Or
-
         result = _build_delete_filter_composite_key(
             ["id", "region"],
             [(1, "us"), (2, "eu"), (3, "ap")],
@@ -1212,7 +1107,7 @@ class TestGetRowCount:
         mock_table = MagicMock()
         mock_table.current_snapshot.return_value = None
 
-        fallback_data = pa.table({"id": [1, 2]})
+        fallback_data = _TABLE_ID12
         mock_scan = MagicMock()
         mock_scan.to_arrow.return_value = fallback_data
         mock_table.scan.return_value = mock_scan
@@ -1226,7 +1121,7 @@ class TestGetRowCount:
         mock_table = MagicMock()
         mock_table.current_snapshot.side_effect = RuntimeError("metadata error")
 
-        fallback_data = pa.table({"id": [1]})
+        fallback_data = _TABLE_ID1
         mock_scan = MagicMock()
         mock_scan.to_arrow.return_value = fallback_data
         mock_table.scan.return_value = mock_scan
@@ -1260,15 +1155,15 @@ class TestTryOptimizedDeleteAppendComposite:
         existing = pa.table(
             {"id": [1, 2, 3], "region": ["us", "eu", "ap"], "value": ["a", "b", "c"]}
         )
-        filtered = pa.table({"id": [1, 2], "region": ["us", "eu"], "value": ["a", "b"]})
-        mock_table = _make_optimized_mock_table(existing, filtered)
+        filtered = _ID_REGION_VALUE_12
+        table = _FakeTable(existing, filtered)
         new_data = pa.table({"id": [1, 2], "region": ["us", "eu"], "value": ["a2", "b2"]})
 
-        result = _try_optimized_delete_append(mock_table, new_data, ["id", "region"])
+        result = _try_optimized_delete_append(table, new_data, ["id", "region"])
 
         assert result == 3  # 3 - 2 + 2
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
+        assert len(table.deleted) == 1
+        assert len(table.appended) == 1
 
     def test_composite_exceeds_threshold_returns_none(self):
         """Composite key with rows > threshold returns None (fall back)."""
@@ -1285,7 +1180,7 @@ class TestTryOptimizedDeleteAppendComposite:
     def test_composite_missing_column_returns_none(self):
         """Returns None if any key column is missing from new_data."""
         mock_table = MagicMock()
-        data = pa.table({"id": [1], "value": ["a"]})
+        data = _ID_VALUE_1
 
         result = _try_optimized_delete_append(mock_table, data, ["id", "region"])
 
@@ -1308,7 +1203,7 @@ class TestTryOptimizedDeleteAppendComposite:
                 "value": ["b"],
             }
         )
-        mock_table = _make_optimized_mock_table(existing, filtered)
+        table = _FakeTable(existing, filtered)
         new_data = pa.table(
             {
                 "id": pa.array([2], type=pa.int64()),
@@ -1317,21 +1212,16 @@ class TestTryOptimizedDeleteAppendComposite:
             }
         )
 
-        result = _try_optimized_delete_append(mock_table, new_data, ["id", "region"])
+        result = _try_optimized_delete_append(table, new_data, ["id", "region"])
 
         assert result == 2  # 2 - 1 + 1
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
+        assert len(table.deleted) == 1
+        assert len(table.appended) == 1
 
     def test_composite_empty_new_data_returns_none(self):
         """Empty new_data returns None (no rows to extract keys from)."""
         mock_table = MagicMock()
-        data = pa.table(
-            {
-                "id": pa.array([], type=pa.int64()),
-                "region": pa.array([], type=pa.string()),
-            }
-        )
+        data = _EMPTY_ID_REGION
 
         result = _try_optimized_delete_append(mock_table, data, ["id", "region"])
 
@@ -1340,19 +1230,13 @@ class TestTryOptimizedDeleteAppendComposite:
 
     def test_composite_delete_failure_returns_none(self):
         """If table.delete() fails for composite keys, returns None (fallback)."""
-        existing = pa.table({"id": [1], "region": ["us"], "value": ["a"]})
-        filtered = pa.table(
-            {
-                "id": pa.array([], type=pa.int64()),
-                "region": pa.array([], type=pa.string()),
-                "value": pa.array([], type=pa.string()),
-            }
+        existing = _ID_REGION_VALUE_1
+        table = _FakeTable(
+            existing, _EMPTY_ID_REGION_VALUE, delete_error=RuntimeError("PyIceberg internal error")
         )
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        mock_table.delete.side_effect = RuntimeError("PyIceberg internal error")
-        new_data = pa.table({"id": [1], "region": ["us"], "value": ["a_new"]})
+        new_data = _ID_REGION_VALUE_1_NEW
 
-        result = _try_optimized_delete_append(mock_table, new_data, ["id", "region"])
+        result = _try_optimized_delete_append(table, new_data, ["id", "region"])
 
         assert result is None
 
@@ -1362,19 +1246,18 @@ class TestDedupNewData:
 
     def test_deduplicates_on_single_key(self):
         """Keeps last row per key (by position) when there are duplicates."""
-        data = pa.table({"id": [1, 2, 2, 3], "value": ["a", "first", "second", "c"]})
+        data = _id_value([1, 2, 2, 3], ["a", "first", "second", "c"])
         result = _dedup_new_data(data, ("id",))
 
         assert len(result) == 3
-        result_dict = {
-            result.column("id")[i].as_py(): result.column("value")[i].as_py()
-            for i in range(len(result))
-        }
+        result_dict = dict(
+            zip(result.column("id").to_pylist(), result.column("value").to_pylist(), strict=True)
+        )
         assert result_dict[2] == "second"  # last row wins
 
     def test_no_duplicates_returns_all_rows(self):
         """When there are no duplicates, all rows are returned."""
-        data = pa.table({"id": [1, 2, 3], "value": ["a", "b", "c"]})
+        data = _ID_VALUE_123
         result = _dedup_new_data(data, ("id",))
 
         assert len(result) == 3
@@ -1392,18 +1275,13 @@ class TestDedupNewData:
 
         assert len(result) == 2  # (1, "us") and (1, "eu")
 
-    def test_uses_provided_connection(self):
-        """When a DuckDB connection is provided, it uses it (no auto-close)."""
-        import duckdb
-
-        conn = duckdb.connect(":memory:")
-        data = pa.table({"id": [1, 1], "value": ["a", "b"]})
-        result = _dedup_new_data(data, ("id",), conn=conn)
+    def test_keeps_surviving_rows_in_input_order(self):
+        """Survivors come back in their original row order, nulls grouped as one key."""
+        data = pa.table({"id": [3, None, 1, 3, None], "value": ["a", "b", "c", "d", "e"]})
+        result = _dedup_new_data(data, ("id",))
 
-        assert len(result) == 1
-        # Connection should still be usable after (not closed)
-        conn.execute("SELECT 1").fetchone()
-        conn.close()
+        assert result.column("id").to_pylist() == [1, 3, None]
+        assert result.column("value").to_pylist() == ["c", "d", "e"]
 
 
 class TestTryOptimizedDeleteAppend:
@@ -1411,16 +1289,16 @@ class TestTryOptimizedDeleteAppend:
 
     def test_composite_key_within_threshold_uses_optimized_path(self):
         """Composite keys with small row count use optimized delete+append."""
-        existing = pa.table({"id": [1, 2], "region": ["us", "eu"], "value": ["a", "b"]})
-        filtered = pa.table({"id": [1], "region": ["us"], "value": ["a"]})
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        new_data = pa.table({"id": [1], "region": ["us"], "value": ["a_new"]})
+        existing = _ID_REGION_VALUE_12
+        filtered = _ID_REGION_VALUE_1
+        table = _FakeTable(existing, filtered)
+        new_data = _ID_REGION_VALUE_1_NEW
 
-        result = _try_optimized_delete_append(mock_table, new_data, ["id", "region"])
+        result = _try_optimized_delete_append(table, new_data, ["id", "region"])
 
         assert result == 2  # 2 - 1 + 1
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
+        assert len(table.deleted) == 1
+        assert len(table.appended) == 1
 
     def test_returns_none_for_missing_key_column(self):
         """If the key column is not in new_data, returns None."""
@@ -1433,45 +1311,42 @@ class TestTryOptimizedDeleteAppend:
 
     def test_single_key_calls_delete_then_append(self):
         """Single-column key: calls table.delete(filter) then table.append(data)."""
-        existing = pa.table({"id": [1, 2, 3], "value": ["a", "b", "c"]})
-        filtered = pa.table({"id": [2], "value": ["b"]})
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        new_data = pa.table({"id": [2, 4], "value": ["b_new", "d"]})
+        existing = _ID_VALUE_123
+        filtered = _ID_VALUE_2
+        table = _FakeTable(existing, filtered)
+        new_data = _id_value([2, 4], ["b_new", "d"])
 
-        result = _try_optimized_delete_append(mock_table, new_data, ["id"])
+        result = _try_optimized_delete_append(table, new_data, ["id"])
 
         assert result == 4  # 3 - 1 + 2
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
+        assert len(table.deleted) == 1
+        assert len(table.appended) == 1
         # Verify appended data is the new_data
-        appended = mock_table.append.call_args[0][0]
+        appended = table.appended[0]
         assert len(appended) == 2
 
     def test_returns_none_on_exception(self):
         """If delete() or append() raises, returns None (fallback)."""
-        existing = pa.table({"id": [1], "value": ["a"]})
-        filtered = pa.table(
-            {"id": pa.array([], type=pa.int64()), "value": pa.array([], type=pa.string())}
+        existing = _ID_VALUE_1
+        filtered = _EMPTY_ID_VALUE
+        table = _FakeTable(
+            existing, filtered, delete_error=RuntimeError("PyIceberg internal error")
         )
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        mock_table.delete.side_effect = RuntimeError("PyIceberg internal error")
-        new_data = pa.table({"id": [1], "value": ["a_new"]})
+        new_data = _id_value([1], ["a_new"])
 
-        result = _try_optimized_delete_append(mock_table, new_data, ["id"])
+        result = _try_optimized_delete_append(table, new_data, ["id"])
 
         assert result is None
 
     def test_no_matching_rows_still_appends(self):
         """When no existing rows match the key, delete is a no-op but append still runs."""
-        existing = pa.table({"id": [1, 2], "value": ["a", "b"]})
-        filtered = pa.table(
-            {"id": pa.array([], type=pa.int64()), "value": pa.array([], type=pa.string())}
-        )
-        mock_table = _make_optimized_mock_table(existing, filtered)
-        new_data = pa.table({"id": [3], "value": ["c"]})
+        existing = _ID_VALUE_12
+        filtered = _EMPTY_ID_VALUE
+        table = _FakeTable(existing, filtered)
+        new_data = _id_value([3], ["c"])
 
-        result = _try_optimized_delete_append(mock_table, new_data, ["id"])
+        result = _try_optimized_delete_append(table, new_data, ["id"])
 
         assert result == 3  # 2 - 0 + 1
-        mock_table.delete.assert_called_once()
-        mock_table.append.assert_called_once()
+        assert len(table.deleted) == 1
+        assert len(table.appended) == 1
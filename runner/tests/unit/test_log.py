@@ -44,11 +44,8 @@ class TestRunLogger:
             log.warn("warn msg")
             log.error("error msg")
 
-        messages = [r.message for r in caplog.records]
-        assert any("debug msg" in m for m in messages)
-        assert any("info msg" in m for m in messages)
-        assert any("warn msg" in m for m in messages)
-        assert any("error msg" in m for m in messages)
+        messages = {r.message for r in caplog.records}
+        assert {"debug msg", "info msg", "warn msg", "error msg"} <= messages
 
     def test_level_mapping(self, caplog: logging.LogCaptureFixture):
         run = RunState(
@@ -62,11 +59,8 @@ class TestRunLogger:
             log.warn("w")
             log.error("e")
 
-        levels = [r.levelno for r in caplog.records]
-        assert logging.DEBUG in levels
-        assert logging.INFO in levels
-        assert logging.WARNING in levels
-        assert logging.ERROR in levels
+        levels = {r.levelno for r in caplog.records}
+        assert {logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR} <= levels
 
     def test_attaches_run_extras_to_python_logger(self, caplog: logging.LogCaptureFixture):
         """RunLogger forwards run_id/request_id/pipeline-key as `extra=` fields
@@ -93,6 +87,20 @@ class TestRunLogger:
         assert rec.layer == "bronze"
         assert rec.pipeline_name == "attendees"
 
+    def test_suppressed_level_still_reaches_run_deque(self, caplog: logging.LogCaptureFixture):
+        """Lines below the stdlib logger's level skip Python logging, not the run deque."""
+        run = RunState(
+            run_id="r1", namespace="ns", layer="silver", pipeline_name="p", trigger="manual"
+        )
+        log = RunLogger(run)
+
+        with caplog.at_level(logging.WARNING, logger="rat_runner.log"):
+            log.debug("quiet")
+            log.warn("loud")
+
+        assert [r.message for r in caplog.records] == ["loud"]
+        assert [r.message for r in run.logs] == ["quiet", "loud"]
+
 
 class TestRunLogExtras:
     def test_returns_all_correlation_fields(self):
@@ -2,27 +2,50 @@
 
 from __future__ import annotations
 
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
-import pytest
-
 from rat_runner.config import NessieConfig, S3Config
 from rat_runner.maintenance import expire_snapshots, remove_orphan_files, run_maintenance
 
 
-@pytest.fixture
-def s3_config() -> S3Config:
-    return S3Config(
-        endpoint="minio:9000",
-        access_key="test-access-key",
-        secret_key="test-secret-key",
-        bucket="rat",
-    )
+class _FakeManageSnapshots:
+    """What _FakeSnapshotTable.manage_snapshots() returns.
+
+    commit() records itself and trims the table's snapshot list to ``remaining``,
+    the way PyIceberg updates table.metadata in place after a commit.
+    """
+
+    __slots__ = ("_remaining", "_snapshots", "commits", "older_than_ms")
+
+    def __init__(self, snapshots: list[object], remaining: int) -> None:
+        self._snapshots = snapshots
+        self._remaining = remaining
+        self.commits = 0
+        self.older_than_ms: int | None = None
+
+    def expire_snapshots_older_than(self, timestamp_ms: int) -> _FakeManageSnapshots:
+        self.older_than_ms = timestamp_ms
+        return self
+
+    def commit(self) -> None:
+        self.commits += 1
+        del self._snapshots[self._remaining :]
+
+
+class _FakeSnapshotTable:
+    """Just enough of a PyIceberg table for expire_snapshots: a snapshot list and
+    manage_snapshots(). ``remaining`` snapshots survive the expiry commit."""
 
+    __slots__ = ("manage", "metadata")
 
-@pytest.fixture
-def nessie_config() -> NessieConfig:
-    return NessieConfig(url="http://nessie:19120/api/v1")
+    def __init__(self, snapshot_count: int, remaining: int) -> None:
+        snapshots = [object() for _ in range(snapshot_count)]
+        self.metadata = SimpleNamespace(snapshots=snapshots)
+        self.manage = _FakeManageSnapshots(snapshots, remaining)
+
+    def manage_snapshots(self) -> _FakeManageSnapshots:
+        return self.manage
 
 
 class TestExpireSnapshots:
@@ -41,22 +64,16 @@ class TestExpireSnapshots:
         mock_catalog = MagicMock()
         mock_get_catalog.return_value = mock_catalog
 
-        mock_table = MagicMock()
-        mock_table.metadata.snapshots = [MagicMock(), MagicMock(), MagicMock()]
-        mock_catalog.load_table.return_value = mock_table
-
-        # After commit, reload shows fewer snapshots
-        mock_table_after = MagicMock()
-        mock_table_after.metadata.snapshots = [MagicMock()]
-        mock_catalog.load_table.side_effect = [mock_table, mock_table_after]
-
-        mock_manage = MagicMock()
-        mock_table.manage_snapshots.return_value = mock_manage
-        mock_manage.expire_snapshots_older_than.return_value = mock_manage
+        # The commit leaves 1 of 3 snapshots on the in-memory table metadata.
+        table = _FakeSnapshotTable(3, remaining=1)
+        mock_catalog.load_table.return_value = table
 
         result = expire_snapshots("default.silver.orders", 7, s3_config, nessie_config)
         assert result == 2
-        mock_manage.commit.assert_called_once()
+        assert table.manage.commits == 1
+        assert table.manage.older_than_ms is not None
+        # Counted from the committed metadata, not a second catalog round-trip.
+        mock_catalog.load_table.assert_called_once_with("default.silver.orders")
 
     @patch("rat_runner.maintenance.get_catalog")
     def test_no_snapshots_to_expire(
@@ -65,21 +82,29 @@ class TestExpireSnapshots:
         mock_catalog = MagicMock()
         mock_get_catalog.return_value = mock_catalog
 
-        mock_table = MagicMock()
-        mock_table.metadata.snapshots = [MagicMock()]
-        mock_catalog.load_table.return_value = mock_table
-
-        mock_manage = MagicMock()
-        mock_table.manage_snapshots.return_value = mock_manage
-        mock_manage.expire_snapshots_older_than.return_value = mock_manage
-
-        # Same count after commit
-        mock_table_after = MagicMock()
-        mock_table_after.metadata.snapshots = [MagicMock()]
-        mock_catalog.load_table.side_effect = [mock_table, mock_table_after]
+        # Only the current snapshot: nothing can expire, so no commit is made.
+        table = _FakeSnapshotTable(1, remaining=1)
+        mock_catalog.load_table.return_value = table
 
         result = expire_snapshots("default.silver.orders", 7, s3_config, nessie_config)
         assert result == 0
+        assert table.manage.commits == 0
+
+    @patch("rat_runner.maintenance.get_catalog")
+    def test_uses_preloaded_table(
+        self, mock_get_catalog: MagicMock, s3_config: S3Config, nessie_config: NessieConfig
+    ) -> None:
+        table = _FakeSnapshotTable(3, remaining=1)
+
+        result = expire_snapshots(
+            "default.silver.orders",
+            7,
+            s3_config,
+            nessie_config,
+            table=table,  # type: ignore[arg-type]
+        )
+        assert result == 2
+        mock_get_catalog.assert_not_called()
 
     @patch("rat_runner.maintenance.get_catalog", side_effect=Exception("catalog error"))
     def test_returns_zero_on_catalog_error(
@@ -99,37 +124,62 @@ class TestRemoveOrphanFiles:
 
 
 class TestRunMaintenance:
+    @patch("rat_runner.maintenance.get_catalog")
     @patch("rat_runner.maintenance.expire_snapshots", return_value=2)
     @patch("rat_runner.maintenance.remove_orphan_files", return_value=1)
     def test_runs_both_tasks(
         self,
         mock_remove: MagicMock,
         mock_expire: MagicMock,
+        mock_get_catalog: MagicMock,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ) -> None:
         mock_log = MagicMock()
         run_maintenance("default.silver.orders", s3_config, nessie_config, log=mock_log)
 
-        mock_expire.assert_called_once_with("default.silver.orders", 7, s3_config, nessie_config)
-        mock_remove.assert_called_once_with("default.silver.orders", 3, s3_config, nessie_config)
+        # The table is loaded once and handed to both tasks.
+        mock_catalog = mock_get_catalog.return_value
+        mock_catalog.load_table.assert_called_once_with("default.silver.orders")
+        table = mock_catalog.load_table.return_value
+        mock_expire.assert_called_once_with(
+            "default.silver.orders", 7, s3_config, nessie_config, table=table
+        )
+        mock_remove.assert_called_once_with(
+            "default.silver.orders", 3, s3_config, nessie_config, table=table
+        )
         assert mock_log.info.call_count >= 3  # start + expired + removed + complete
 
+    @patch("rat_runner.maintenance.get_catalog")
     @patch("rat_runner.maintenance.expire_snapshots", side_effect=Exception("boom"))
     def test_continues_on_failure(
-        self, mock_expire: MagicMock, s3_config: S3Config, nessie_config: NessieConfig
+        self,
+        mock_expire: MagicMock,
+        mock_get_catalog: MagicMock,
+        s3_config: S3Config,
+        nessie_config: NessieConfig,
     ) -> None:
         mock_log = MagicMock()
         # Should not raise
         run_maintenance("default.silver.orders", s3_config, nessie_config, log=mock_log)
         mock_log.warn.assert_called_once()
 
+    @patch("rat_runner.maintenance.get_catalog", side_effect=Exception("catalog error"))
+    def test_catalog_failure_is_non_fatal(
+        self, mock_get_catalog: MagicMock, s3_config: S3Config, nessie_config: NessieConfig
+    ) -> None:
+        mock_log = MagicMock()
+        run_maintenance("default.silver.orders", s3_config, nessie_config, log=mock_log)
+        mock_log.warn.assert_called_once()
+
+    @patch("rat_runner.maintenance.get_catalog")
     @patch("rat_runner.maintenance.expire_snapshots", return_value=0)
     @patch("rat_runner.maintenance.remove_orphan_files", return_value=0)
     def test_no_log_for_zero_results(
         self,
         mock_remove: MagicMock,
         mock_expire: MagicMock,
+        mock_get_catalog: MagicMock,
         s3_config: S3Config,
         nessie_config: NessieConfig,
     ) -> None:
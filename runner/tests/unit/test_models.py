@@ -3,6 +3,12 @@
 from __future__ import annotations
 
 import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+
+import pytest
 
 from rat_runner.models import (
     LogRecord,
@@ -14,87 +20,105 @@ from rat_runner.models import (
 )
 
 
-class TestRunStatus:
-    def test_pending_is_not_terminal(self):
-        assert not RunStatus.PENDING.is_terminal()
+def _new_run() -> RunState:
+    return RunState(
+        run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
+    )
+
+
+@pytest.fixture
+def run() -> RunState:
+    """A fresh RunState per test — add_log and status changes must not leak."""
+    return _new_run()
+
+
+@pytest.fixture(scope="module")
+def default_run() -> RunState:
+    """One RunState shared by the read-only default-value tests; never mutate it."""
+    return _new_run()
+
 
-    def test_running_is_not_terminal(self):
-        assert not RunStatus.RUNNING.is_terminal()
+@pytest.fixture(scope="module")
+def pool() -> Iterator[ThreadPoolExecutor]:
+    """Worker threads shared by the concurrency tests, started once per module.
 
-    def test_success_is_terminal(self):
-        assert RunStatus.SUCCESS.is_terminal()
+    Four workers: enough for every task behind each test's barrier to run at once.
+    """
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
 
-    def test_failed_is_terminal(self):
-        assert RunStatus.FAILED.is_terminal()
 
-    def test_cancelled_is_terminal(self):
-        assert RunStatus.CANCELLED.is_terminal()
+class TestRunStatus:
+    @pytest.mark.parametrize(
+        ("status", "expected"),
+        [
+            (RunStatus.PENDING, False),
+            (RunStatus.RUNNING, False),
+            (RunStatus.SUCCESS, True),
+            (RunStatus.FAILED, True),
+            (RunStatus.CANCELLED, True),
+        ],
+        ids=["pending", "running", "success", "failed", "cancelled"],
+    )
+    def test_is_terminal(self, status: RunStatus, expected: bool):
+        assert status.is_terminal() is expected
 
 
 class TestRunState:
-    def test_initial_status_is_pending(self):
-        run = RunState(
-            run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
-        )
-        assert run.status == RunStatus.PENDING
-        assert run.rows_written == 0
-        assert run.duration_ms == 0
-        assert run.error == ""
+    def test_initial_status_is_pending(self, default_run: RunState):
+        assert default_run.status == RunStatus.PENDING
+        assert default_run.rows_written == 0
+        assert default_run.duration_ms == 0
+        assert default_run.error == ""
 
-    def test_add_log_appends_record(self):
-        run = RunState(
-            run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
-        )
+    def test_add_log_appends_record(self, run: RunState):
         run.add_log("info", "hello")
         assert len(run.logs) == 1
         assert run.logs[0].level == "info"
         assert run.logs[0].message == "hello"
 
-    def test_add_log_is_thread_safe(self):
-        run = RunState(
-            run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
-        )
+    def test_add_log_is_thread_safe(self, run: RunState, pool: ThreadPoolExecutor):
         barrier = threading.Barrier(4)
 
         def writer(start: int):
+            # Format before the barrier so the threads race only on add_log.
+            messages = [f"msg-{start + i}" for i in range(100)]
             barrier.wait()
-            for i in range(100):
-                run.add_log("info", f"msg-{start + i}")
+            for message in messages:
+                run.add_log("info", message)
 
-        threads = [threading.Thread(target=writer, args=(i * 100,)) for i in range(4)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        futures = [pool.submit(writer, i * 100) for i in range(4)]
+        for future in futures:
+            future.result()
 
         assert len(run.logs) == 400
 
     def test_log_deque_bounded(self):
         run = RunState(
-            run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
+            run_id="r1",
+            namespace="ns",
+            layer="silver",
+            pipeline_name="orders",
+            trigger="manual",
+            max_log_records=10,
         )
-        for i in range(15_000):
+        for i in range(15):
             run.add_log("info", f"msg-{i}")
 
-        assert len(run.logs) == 10_000
+        assert len(run.logs) == 10
         # Oldest entries were evicted
-        assert run.logs[0].message == "msg-5000"
+        assert run.logs[0].message == "msg-5"
 
-    def test_is_terminal_delegates_to_status(self):
-        run = RunState(
-            run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
-        )
+    def test_log_deque_default_capacity(self, default_run: RunState):
+        assert default_run.logs.maxlen == 10_000
+
+    def test_is_terminal_delegates_to_status(self, run: RunState):
         assert not run.is_terminal()
         run.status = RunStatus.SUCCESS
         assert run.is_terminal()
 
-    def test_add_log_notifies_wait_for_logs(self):
+    def test_add_log_notifies_wait_for_logs(self, run: RunState):
         """add_log wakes threads blocked in wait_for_logs."""
-        import time
-
-        run = RunState(
-            run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
-        )
         woke_up = threading.Event()
 
         def waiter():
@@ -104,8 +128,13 @@ class TestRunState:
         t = threading.Thread(target=waiter)
         t.start()
 
-        # Give the waiter thread time to enter wait()
-        time.sleep(0.1)
+        # Wait until the waiter is actually parked in Condition.wait() rather
+        # than sleeping a fixed interval and hoping it got there; a notify sent
+        # any earlier would be missed.
+        deadline = time.monotonic() + 2
+        while not run._log_condition._waiters:  # type: ignore[attr-defined]
+            assert time.monotonic() < deadline, "Waiter never entered wait_for_logs"
+            time.sleep(0.001)
 
         before = time.time()
         run.add_log("info", "wake up")
@@ -116,11 +145,8 @@ class TestRunState:
         assert woke_up.is_set(), "Waiter should have been woken by add_log"
         assert elapsed < 0.5, f"Wakeup took {elapsed:.3f}s — should be near-instant"
 
-    def test_get_logs_from_returns_entries_after_cursor(self):
+    def test_get_logs_from_returns_entries_after_cursor(self, run: RunState):
         """get_logs_from returns only entries from the given cursor position."""
-        run = RunState(
-            run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
-        )
         run.add_log("info", "first")
         run.add_log("info", "second")
         run.add_log("info", "third")
@@ -141,46 +167,34 @@ class TestRunState:
         empty = run.get_logs_from(3)
         assert empty == []
 
-    def test_get_logs_from_is_thread_safe(self):
+    def test_get_logs_from_is_thread_safe(self, run: RunState, pool: ThreadPoolExecutor):
         """get_logs_from can be called concurrently with add_log."""
-        run = RunState(
-            run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
-        )
         barrier = threading.Barrier(3)
         results: list[list] = [[] for _ in range(2)]
 
+        messages = [f"msg-{i}" for i in range(50)]
+
         def writer():
             barrier.wait()
-            for i in range(50):
-                run.add_log("info", f"msg-{i}")
+            for message in messages:
+                run.add_log("info", message)
 
         def reader(idx: int):
             barrier.wait()
             for _ in range(50):
                 results[idx].append(len(run.get_logs_from(0)))
 
-        threads = [
-            threading.Thread(target=writer),
-            threading.Thread(target=reader, args=(0,)),
-            threading.Thread(target=reader, args=(1,)),
-        ]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        futures = [pool.submit(writer), pool.submit(reader, 0), pool.submit(reader, 1)]
+        for future in futures:
+            future.result()
 
         # Readers should have seen monotonically non-decreasing counts
         for counts in results:
             for a, b in zip(counts, counts[1:], strict=False):
                 assert a <= b, f"Log count went backwards: {a} > {b}"
 
-    def test_wait_for_logs_returns_on_timeout(self):
+    def test_wait_for_logs_returns_on_timeout(self, run: RunState):
         """wait_for_logs returns after the timeout even without new logs."""
-        import time
-
-        run = RunState(
-            run_id="r1", namespace="ns", layer="silver", pipeline_name="orders", trigger="manual"
-        )
         start = time.time()
         run.wait_for_logs(timeout=0.1)
         elapsed = time.time() - start
@@ -199,12 +213,21 @@ class TestLogRecord:
 class TestMergeStrategy:
     def test_has_six_members(self):
         assert len(MergeStrategy) == 6
-        assert MergeStrategy.FULL_REFRESH == "full_refresh"
-        assert MergeStrategy.INCREMENTAL == "incremental"
-        assert MergeStrategy.APPEND_ONLY == "append_only"
-        assert MergeStrategy.DELETE_INSERT == "delete_insert"
-        assert MergeStrategy.SCD2 == "scd2"
-        assert MergeStrategy.SNAPSHOT == "snapshot"
+
+    @pytest.mark.parametrize(
+        ("member", "value"),
+        [
+            (MergeStrategy.FULL_REFRESH, "full_refresh"),
+            (MergeStrategy.INCREMENTAL, "incremental"),
+            (MergeStrategy.APPEND_ONLY, "append_only"),
+            (MergeStrategy.DELETE_INSERT, "delete_insert"),
+            (MergeStrategy.SCD2, "scd2"),
+            (MergeStrategy.SNAPSHOT, "snapshot"),
+        ],
+        ids=["full_refresh", "incremental", "append_only", "delete_insert", "scd2", "snapshot"],
+    )
+    def test_member_values(self, member: MergeStrategy, value: str):
+        assert member == value
 
     def test_is_str_subclass(self):
         assert isinstance(MergeStrategy.FULL_REFRESH, str)
@@ -232,11 +255,8 @@ class TestPipelineConfig:
 
     def test_frozen(self):
         config = PipelineConfig(description="test")
-        try:
+        with pytest.raises(FrozenInstanceError):
             config.description = "changed"  # type: ignore[misc]
-            assert False, "Should have raised"
-        except AttributeError:
-            pass
 
     def test_watermark_column(self):
         config = PipelineConfig(watermark_column="updated_at")
@@ -277,17 +297,13 @@ class TestQualityTestResult:
             status="pass",
             row_count=0,
         )
-        try:
+        with pytest.raises(FrozenInstanceError):
             result.status = "fail"  # type: ignore[misc]
-            assert False, "Should have raised"
-        except AttributeError:
-            pass
 
 
 class TestRunStateNewFields:
     def test_created_at_is_set(self):
-        import time
-
+        # Builds its own RunState: created_at must fall inside this test's window.
         before = time.time()
         run = RunState(
             run_id="r1",
@@ -299,32 +315,11 @@ class TestRunStateNewFields:
         after = time.time()
         assert before <= run.created_at <= after
 
-    def test_branch_default_empty(self):
-        run = RunState(
-            run_id="r1",
-            namespace="ns",
-            layer="silver",
-            pipeline_name="orders",
-            trigger="manual",
-        )
-        assert run.branch == ""
+    def test_branch_default_empty(self, default_run: RunState):
+        assert default_run.branch == ""
 
-    def test_env_default_empty(self):
-        run = RunState(
-            run_id="r1",
-            namespace="ns",
-            layer="silver",
-            pipeline_name="orders",
-            trigger="manual",
-        )
-        assert run.env == {}
+    def test_env_default_empty(self, default_run: RunState):
+        assert default_run.env == {}
 
-    def test_quality_results_default_empty(self):
-        run = RunState(
-            run_id="r1",
-            namespace="ns",
-            layer="silver",
-            pipeline_name="orders",
-            trigger="manual",
-        )
-        assert run.quality_results == []
+    def test_quality_results_default_empty(self, default_run: RunState):
+        assert default_run.quality_results == []
@@ -5,9 +5,7 @@ from __future__ import annotations
 from unittest.mock import MagicMock, patch
 
 import pyarrow as pa
-import pytest
 
-from rat_runner.config import NessieConfig, S3Config
 from rat_runner.preview import (
     _extract_columns,
     preview_pipeline,
@@ -16,22 +14,6 @@ from rat_runner.preview import (
 _MOD = "rat_runner.preview"
 
 
-@pytest.fixture
-def s3_config() -> S3Config:
-    return S3Config(
-        endpoint="localhost:9000",
-        access_key="test-access-key",
-        secret_key="test-secret-key",
-        bucket="test-bucket",
-        use_ssl=False,
-    )
-
-
-@pytest.fixture
-def nessie_config() -> NessieConfig:
-    return NessieConfig(url="http://localhost:19120/api/v1")
-
-
 class TestExtractColumns:
     def test_extracts_names_and_types(self):
         table = pa.table({"id": [1, 2], "name": ["a", "b"]})